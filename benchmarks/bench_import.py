@@ -0,0 +1,71 @@
+"""
+Import-time benchmark for marketflow.
+
+Runs `import marketflow` in fresh interpreters and checks that:
+    - no heavy dependency (pandas, numpy, requests, bs4, tabulate) is loaded,
+    - no market extractor module is loaded,
+    - the local database is not opened,
+    - the median import time stays under a budget.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 10] [--budget-ms 50]
+
+The exit status is 1 when one of the checks fails, so that it can guard releases.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+HEAVY_MODULES = ["pandas", "numpy", "requests", "bs4", "tabulate", "sqlite3"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import marketflow
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "heavy": [m for m in %r if m in sys.modules],
+    "extractors": [m for m in sys.modules if m.startswith("marketflow.__marketconfig__")],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_probe():
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark `import marketflow`.")
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="maximum median import time")
+    args = parser.parse_args()
+
+    probes = [run_probe() for _ in range(args.runs)]
+    median_ms = statistics.median(p["elapsed"] for p in probes) * 1000
+
+    print(f"import marketflow: median {median_ms:.2f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    if probes[0]["heavy"]:
+        failures.append(f"heavy modules loaded at import: {', '.join(probes[0]['heavy'])}")
+    if probes[0]["extractors"]:
+        failures.append(f"extractor modules loaded at import: {', '.join(probes[0]['extractors'])}")
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.2f} ms is over budget")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Offline benchmark suite for marketflow.
+
+Starts the local SikaFinance stand-in (`sika_server.py`) in a separate process, points
+marketflow to it and to a temporary database, then measures:
+
+    - tickers : MarketTickers.getTickers (scrape and cached),
+    - data    : MarketData.getData over symbol counts x date spans x workers,
+                cold (downloaded) and warm (served from the local store),
+    - db      : the DBManager layer (ticker upsert, history save/read, gap search).
+
+Every scenario is repeated and its median and minimum wall time are reported. Results
+can be written to JSON and compared with a previous run, e.g. before upgrading:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --compare before.json
+
+The stand-in data is deterministic, so two runs of the same version on the same
+machine measure the same work.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args):
+    """
+    Launch the stand-in server in its own process and wait until it accepts connections.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "sika_server.py"), "--port", str(port),
+         "--shares", str(args.shares), "--latency-ms", str(args.latency_ms),
+         "--error-rate", str(args.error_rate), "--extra-fields", str(args.extra_fields),
+         "--page-kb", str(args.page_kb)],
+        stdout=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.1):
+            return process, f"http://127.0.0.1:{port}"
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("the stand-in server did not start")
+
+
+def measure(func, repeat):
+    """
+    Run `func` `repeat` times (its prints are silenced) and return the timings in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(args):
+    from marketflow import MarketData, MarketTickers, MarketRegistry
+    from marketflow.__db_manager__ import DBManager
+
+    results = {}
+
+    def record(group, name, timings):
+        results[f"{group}/{name}"] = {"median": statistics.median(timings), "min": min(timings), "runs": len(timings)}
+        print(f"{group:8} {name:42} median {statistics.median(timings) * 1000:10.1f} ms   min {min(timings) * 1000:10.1f} ms")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        MarketRegistry()
+
+    # tickers
+    tickers = MarketTickers()
+    record("tickers", "getTickers (scrape)", measure(lambda: tickers.getTickers("BRVM", force_refresh=True), args.repeat))
+    record("tickers", "getTickers (cached)", measure(lambda: tickers.getTickers("BRVM"), args.repeat))
+
+    # data
+    data = MarketData()
+    universe = [symbol.split(".")[0] for symbol in DBManager().__full_version_ticker_list__("BRVM") if "." in symbol]
+    end_date = args.end_date
+    for n_symbols in args.symbols:
+        symbols = universe[:n_symbols]
+        for span in args.spans:
+            start_date = time.strftime("%Y-%m-%d", time.localtime(time.mktime(time.strptime(end_date, "%Y-%m-%d")) - span * 86400))
+            for workers in args.workers:
+                name = f"getData {len(symbols):3d} sym x {span:5d} d, {workers:2d} workers"
+                cold = lambda: data.getData("BRVM", symbols, start_date=start_date, end_date=end_date, max_workers=workers, refresh=True)
+                record("data", name + " cold", measure(cold, args.repeat))
+            warm = lambda: data.getData("BRVM", symbols, start_date=start_date, end_date=end_date)
+            record("data", f"getData {len(symbols):3d} sym x {span:5d} d, warm", measure(warm, args.repeat))
+
+    # db layer
+    db = DBManager()
+    rows = [("SHARE", f"B{i:04d}", f"B{i:04d}.ci", f"Bench {i}", "CI") for i in range(args.db_tickers)]
+    record("db", f"__upsert_tickers__ {len(rows)} rows", measure(lambda: db.__upsert_tickers__("BRVM", rows), args.repeat))
+    history = [(time.strftime("%Y-%m-%d", time.gmtime(946684800 + i * 86400)), 1.0, 2.0, 0.5, 1.5, 100.0) for i in range(args.db_rows)]
+    last_date = history[-1][0]
+    record("db", f"__save_price_history__ {len(history)} rows",
+           measure(lambda: db.__save_price_history__("BRVM", "B0000.ci", "daily", history, [("2000-01-01", last_date)]), args.repeat))
+    record("db", f"__get_price_history__ {len(history)} rows",
+           measure(lambda: db.__get_price_history__("BRVM", "B0000.ci", "daily", "2000-01-01", last_date), args.repeat))
+    record("db", "__missing_ranges__",
+           measure(lambda: db.__missing_ranges__("BRVM", "B0000.ci", "daily", "1999-01-01", "2099-01-01"), args.repeat))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline marketflow benchmarks.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--spans", type=int, nargs="+", default=[90, 365, 1825], help="date spans in days")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--end-date", default="2024-12-31")
+    parser.add_argument("--shares", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--extra-fields", type=int, default=0)
+    parser.add_argument("--page-kb", type=int, default=300)
+    parser.add_argument("--db-tickers", type=int, default=500)
+    parser.add_argument("--db-rows", type=int, default=20000)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with a previous JSON result file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="marketflow-bench-")
+    server, base_url = start_server(args)
+    os.environ["MARKETFLOW_SIKAFINANCE_URL"] = base_url
+    os.environ["MARKETFLOW_DB_PATH"] = os.path.join(workdir, "bench.db")
+    sys.path.insert(0, SRC)
+
+    try:
+        results = run(args)
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            previous = json.load(fp)["results"]
+        print("\nChange of the median against", args.compare)
+        for name, result in results.items():
+            if name in previous:
+                ratio = result["median"] / previous[name]["median"]
+                print(f"{name:60} x{ratio:6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Local stand-in for the SikaFinance endpoints used by marketflow.
+
+Serves:
+    - GET  /                       homepage with the `#dpShares` ticker list (ETag and
+                                   Last-Modified validators, 304 when unchanged),
+    - POST /api/general/GetHistos  OHLCV history in the same JSON shape as the real API.
+
+Prices are generated deterministically from the ticker and the date, so two runs with
+the same options return the same bytes. Latency, payload size and error rate are
+configurable to reproduce slow or flaky conditions.
+
+Usage:
+    python benchmarks/sika_server.py --port 8765 --latency-ms 40 --error-rate 0.02
+
+Point marketflow to it with:
+    MARKETFLOW_SIKAFINANCE_URL=http://127.0.0.1:8765
+"""
+
+import argparse
+import gzip
+import hashlib
+import http.server
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def make_symbols(n_shares: int, n_indexes: int = 5):
+    """
+    Build a ticker universe shaped like the BRVM one (indexes without suffix, shares with a country suffix).
+    """
+    countries = ["ci", "sn", "bj", "bf", "ml", "ne", "tg"]
+    indexes = ["BRVMC", "BRVM30", "BRVMPR", "BRVMAG", "BRVMFI", "BRVMDI", "BRVMIN", "BRVMSP", "BRVMTR", "BRVMAS"]
+    symbols = indexes[:n_indexes]
+    for i in range(n_shares):
+        symbols.append(f"S{i:03d}X.{countries[i % len(countries)]}")
+    return symbols
+
+
+class SikaStandIn:
+    """
+    Deterministic data source behind the stand-in server.
+
+    Attributes:
+        symbols (list[str]): Native tickers listed on the homepage.
+        latency (float): Delay added to every response, in seconds.
+        error_rate (float): Share of GetHistos calls answered with HTTP 503.
+        extra_fields (int): Padding fields added to each observation (bigger payloads).
+        page_kb (int): Filler added to the homepage, in kilobytes.
+        listing_start (str): No data is returned before this date ('YYYY-MM-DD').
+    """
+
+    def __init__(self, symbols, latency=0.0, error_rate=0.0, extra_fields=0, page_kb=0,
+                 listing_start="1998-09-16", seed=0):
+        self.symbols = symbols
+        self.latency = latency
+        self.error_rate = error_rate
+        self.extra_fields = extra_fields
+        self.page_kb = page_kb
+        self.listing_start = datetime.strptime(listing_start, "%Y-%m-%d")
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"histos": 0, "homepage": 0, "not_modified": 0, "errors": 0, "bytes": 0}
+
+    def homepage(self):
+        options = "".join(f'<option value="{s}">{s.split(".")[0]} - Company {s}</option>' for s in self.symbols)
+        filler = "<div class='news'>" + ("x" * 1024 + "</div><div class='news'>") * self.page_kb + "</div>"
+        return (
+            "<html><head><title>Sika Finance</title></head><body>"
+            f"{filler}<select id='dpShares'><option value=''>Choisir une valeur</option>{options}</select>"
+            f"{filler}</body></html>"
+        ).encode("utf-8")
+
+    def histos(self, body):
+        with self.lock:
+            fail = self.random.random() < self.error_rate
+        if fail:
+            return None
+
+        start = max(datetime.strptime(body["datedeb"], "%Y-%m-%d"), self.listing_start)
+        end = datetime.strptime(body["datefin"], "%Y-%m-%d")
+        step = {"0": 1, "7": 7, "30": 30, "91": 365}.get(str(body.get("xperiod", "0")), 1)
+        seed = int(hashlib.md5(body["ticker"].encode()).hexdigest()[:6], 16)
+
+        lst = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                k = (day - datetime(1998, 1, 1)).days + seed
+                close = 1000 + (k * 37) % 500
+                row = {
+                    "Date": day.strftime("%d/%m/%Y"),
+                    "Open": close - k % 7,
+                    "High": close + k % 11,
+                    "Low": close - k % 13,
+                    "Close": close,
+                    "Volume": (k * 53) % 10000,
+                }
+                for i in range(self.extra_fields):
+                    row[f"Extra{i}"] = k % (i + 2)
+                lst.append(row)
+            day += timedelta(days=step)
+
+        if not lst:
+            return {"error": "nodata"}
+        return {"lst": lst}
+
+
+def make_handler(source: SikaStandIn):
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code, payload, content_type, headers=None):
+            if payload and "gzip" in self.headers.get("Accept-Encoding", ""):
+                payload = gzip.compress(payload, compresslevel=5)
+                encoding = "gzip"
+            else:
+                encoding = None
+            if source.latency:
+                time.sleep(source.latency)
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+            with source.lock:
+                source.stats["bytes"] += len(payload)
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/":
+                return self._send(404, b"", "text/plain")
+            with source.lock:
+                source.stats["homepage"] += 1
+            page = source.homepage()
+            etag = '"' + hashlib.md5(page).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with source.lock:
+                    source.stats["not_modified"] += 1
+                return self._send(304, b"", "text/html; charset=utf-8", {"ETag": etag})
+            self._send(200, page, "text/html; charset=utf-8", {"ETag": etag, "Last-Modified": "Mon, 02 Sep 2024 08:00:00 GMT"})
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/api/general/GetHistos":
+                return self._send(404, b"", "text/plain")
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with source.lock:
+                source.stats["histos"] += 1
+            answer = source.histos(body)
+            if answer is None:
+                with source.lock:
+                    source.stats["errors"] += 1
+                return self._send(503, b"", "text/plain")
+            self._send(200, json.dumps(answer).encode("utf-8"), "application/json")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(source: SikaStandIn, host="127.0.0.1", port=0):
+    """
+    Start the stand-in server in a background thread.
+
+    Returns:
+        tuple: (server, base_url).
+    """
+    server = http.server.ThreadingHTTPServer((host, port), make_handler(source))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SikaFinance stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--shares", type=int, default=45, help="number of share tickers")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--extra-fields", type=int, default=0)
+    parser.add_argument("--page-kb", type=int, default=300, help="homepage filler size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = SikaStandIn(make_symbols(args.shares), latency=args.latency_ms / 1000, error_rate=args.error_rate,
+                         extra_fields=args.extra_fields, page_kb=args.page_kb, seed=args.seed)
+    server = http.server.ThreadingHTTPServer((args.host, args.port), make_handler(source))
+    print(f"SikaFinance stand-in listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Columnar on-disk cache of downloaded history (Parquet or Feather).
+
+The local SQLite store remains the reference; this cache mirrors it with one file per
+market, period and symbol:
+
+    <cache_dir>/<market>/<period>/<symbol>.parquet
+
+so that reloading years of history is a handful of columnar reads, limited to the
+requested date range, instead of rebuilding frames row by row. Each partition carries
+the version of the stored history it was built from: a partition older than the store
+is not served.
+"""
+
+import os
+import threading
+
+
+class ColumnarCache():
+    """
+    A partitioned Parquet/Feather mirror of the `price_history` table.
+
+    Attributes:
+        cache_dir (str): Root directory of the cache.
+        fmt (str): File format, 'parquet' (default) or 'feather'.
+    """
+
+    FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+
+    VERSION_KEY = b"marketflow.version"
+
+    def __init__(self, cache_dir: str, fmt: str = "parquet"):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"[Error] the cache format '{fmt}' is not supported.")
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("The columnar cache needs pyarrow: pip install marketflow[columnar]")
+
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self._lock = threading.Lock()
+
+    def __path__(self, market: str, period: str, symbol: str):
+        """
+        Return the file of one (market, period, symbol) partition.
+        """
+        return os.path.join(self.cache_dir, market, period, symbol.replace(os.sep, "_") + self.FORMATS[self.fmt])
+
+    def __read__(self, market: str, period: str, symbol: str, start_date: str = None, end_date: str = None, version: int = None):
+        """
+        Read one partition, limited to a date range.
+
+        Args:
+            market (str): Shortname of the market.
+            period (str): Data frequency.
+            symbol (str): Native ticker symbol.
+            start_date (str, optional): First date to read ('YYYY-MM-DD').
+            end_date (str, optional): Last date to read ('YYYY-MM-DD').
+            version (int, optional): Version of the stored history the partition must have
+                been written from. Default is any.
+
+        Returns:
+            pd.DataFrame | None: The rows sorted by date, or None if the partition does not
+                exist or was written from another version.
+        """
+        import pyarrow.compute as pc
+
+        path = self.__path__(market, period, symbol)
+        if not os.path.exists(path):
+            return None
+
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            # the footer alone tells the version: an outdated partition is not read
+            if version is not None and not self.__current__(pq.read_schema(path), version):
+                return None
+            filters = []
+            if start_date:
+                filters.append(("Date", ">=", start_date))
+            if end_date:
+                filters.append(("Date", "<=", end_date))
+            table = pq.read_table(path, filters=filters or None)
+        else:
+            import pyarrow.feather as feather
+
+            table = feather.read_table(path, memory_map=True)
+            if version is not None and not self.__current__(table.schema, version):
+                return None
+            mask = None
+            if start_date:
+                mask = pc.greater_equal(table["Date"], start_date)
+            if end_date:
+                upper = pc.less_equal(table["Date"], end_date)
+                mask = upper if mask is None else pc.and_(mask, upper)
+            if mask is not None:
+                table = table.filter(mask)
+
+        return table.to_pandas()
+
+    def __current__(self, schema, version: int):
+        """
+        Tell whether a partition's schema carries the given history version.
+        """
+        return (schema.metadata or {}).get(self.VERSION_KEY) == str(version).encode()
+
+    def __write__(self, market: str, period: str, symbol: str, frame, version: int = None):
+        """
+        Replace one partition with a frame (sorted by date before writing).
+
+        Args:
+            market (str): Shortname of the market.
+            period (str): Data frequency.
+            symbol (str): Native ticker symbol.
+            frame (pd.DataFrame): OHLCV rows with a `Date` column.
+            version (int, optional): Version of the stored history the frame comes from.
+        """
+        import pyarrow as pa
+
+        path = self.__path__(market, period, symbol)
+        table = pa.Table.from_pandas(frame.sort_values("Date"), preserve_index=False)
+        if version is not None:
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), self.VERSION_KEY: str(version).encode()})
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                pq.write_table(table, tmp_path, compression="zstd")
+            else:
+                import pyarrow.feather as feather
+
+                feather.write_feather(table, tmp_path, compression="zstd")
+            # atomic swap: readers never see a half-written partition
+            os.replace(tmp_path, path)
+
+    def __clear__(self, market: str = None):
+        """
+        Delete every partition of a market (or of the whole cache).
+        """
+        import shutil
+
+        target = self.cache_dir if market is None else os.path.join(self.cache_dir, market)
+        shutil.rmtree(target, ignore_errors=True)
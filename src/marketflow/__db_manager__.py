@@ -1,49 +1,131 @@
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import importlib.resources as pkg_resources
 from pathlib import Path
 from marketflow.market_information import MarketInformation
+from marketflow.market_metrics import __span__
+from marketflow.__window_planner__ import __subtract_ranges__
 import marketflow.__data__
 
 
+# one connection per thread and per database file
+_local = threading.local()
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+# columns of price_history that can be queried
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
 class DBManager():
     
     def __init__(self):
         super().__init__()
-        self.db_path = os.path.join(os.path.dirname(__file__), '__data__', 'database.db')
-        self.__open_db__()
-
-        # Table des marchés
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS market (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                shortname TEXT UNIQUE,
-                fullname TEXT,
-                description TEXT,
-                official_url TEXT,
-                created_at TEXT,
-                data_url TEXT
-            )
-        """)
-
-        # Table des tickers
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ticker (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                market_id INTEGER,
-                type TEXT,
-                symbol TEXT,
-                full_symbol TEXT,
-                description TEXT,
-                country TEXT,
-                FOREIGN KEY (market_id) REFERENCES market(id)
-            )
-        """)
+        # MARKETFLOW_DB_PATH points the local store to another file (tests, benchmarks, shared installs)
+        self.db_path = os.environ.get("MARKETFLOW_DB_PATH") or os.path.join(os.path.dirname(__file__), '__data__', 'database.db')
+        # no I/O here: the connection and the schema are created on first use
+
+    def __create_schema__(self, conn):
+        """
+        Create the tables of the local database if they do not exist yet.
+
+        Args:
+            conn (sqlite3.Connection): Connection on which the schema is created.
+        """
+        with conn:
+            cursor = conn.cursor()
+
+            # Table des marchés
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS market (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    shortname TEXT UNIQUE,
+                    fullname TEXT,
+                    description TEXT,
+                    official_url TEXT,
+                    created_at TEXT,
+                    data_url TEXT
+                )
+            """)
+
+            # Table des tickers
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ticker (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    market_id INTEGER,
+                    type TEXT,
+                    symbol TEXT,
+                    full_symbol TEXT,
+                    description TEXT,
+                    country TEXT,
+                    FOREIGN KEY (market_id) REFERENCES market(id)
+                )
+            """)
+
+            # Historique des cours (OHLCV)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_history (
+                    ticker_id INTEGER,
+                    period TEXT,
+                    date TEXT,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    PRIMARY KEY (ticker_id, period, date),
+                    FOREIGN KEY (ticker_id) REFERENCES ticker(id)
+                )
+            """)
+
+            # Plages de dates déjà téléchargées (un jour sans cotation n'est pas un trou)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_history_coverage (
+                    ticker_id INTEGER,
+                    period TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    FOREIGN KEY (ticker_id) REFERENCES ticker(id)
+                )
+            """)
         
+            # Version de l'historique de chaque ticker, incrémentée à chaque écriture (cache en colonnes)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_history_version (
+                    ticker_id INTEGER,
+                    period TEXT,
+                    version INTEGER,
+                    PRIMARY KEY (ticker_id, period),
+                    FOREIGN KEY (ticker_id) REFERENCES ticker(id)
+                )
+            """)
+        
+            # Date du dernier téléchargement de la liste des tickers de chaque marché
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS market_refresh (
+                    market_id INTEGER PRIMARY KEY,
+                    tickers_refreshed_at TEXT,
+                    FOREIGN KEY (market_id) REFERENCES market(id)
+                )
+            """)
+
+            # Validateurs HTTP (ETag / Last-Modified) des pages déjà téléchargées
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS http_validator (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT
+                )
+            """)
+
+            # Un ticker est unique par marché (doublons éventuels des anciennes versions supprimés)
+            cursor.execute("DELETE FROM ticker WHERE id NOT IN (SELECT MIN(id) FROM ticker GROUP BY market_id, symbol)")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_ticker_market_symbol ON ticker (market_id, symbol)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_ticker_market_type ON ticker (market_id, type)")
         
-        #self.delete_table(table=["market"])
-        self.conn.commit()
-        self.__close_db__()
+            #self.delete_table(table=["market"])
 
     def __addmarket_to_local_db__(self, market: MarketInformation):
         """
@@ -56,30 +138,28 @@ class DBManager():
             market (MarketInformation): Market object containing metadata such as
                 shortname, fullname, description, official_url, created_at, and data_url.
         """        
-        self.__open_db__()
+        with self.__transaction__() as cursor:
         
-        self.cursor.execute("SELECT * FROM market WHERE shortname = ?",(market.short_name,))
-        existing_market = self.cursor.fetchone()
+            cursor.execute("SELECT * FROM market WHERE shortname = ?",(market.short_name,))
+            existing_market = cursor.fetchone()
         
-        if existing_market == None:
-            self.cursor.execute(
-                """
-                INSERT OR IGNORE INTO market (shortname,fullname,description,official_url,created_at,data_url)
-                VALUES (?,?,?,?,?,?)
-                """,
-                (market.short_name,market.full_name,market.description,market.official_url,market.created_at,market.data_url,)
-            )
-        else:
+            if existing_market == None:
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO market (shortname,fullname,description,official_url,created_at,data_url)
+                    VALUES (?,?,?,?,?,?)
+                    """,
+                    (market.short_name,market.full_name,market.description,market.official_url,market.created_at,market.data_url,)
+                )
+            else:
             
-            self.cursor.execute(
-                """
-                UPDATE market SET shortname = ?,fullname = ?,description = ?,official_url = ?,created_at = ?,data_url = ? WHERE id = ?
-                """,
-                (market.short_name,market.full_name,market.description,market.official_url,market.created_at,market.data_url,int(existing_market[0]),)
-            )
-        self.conn.commit()
+                cursor.execute(
+                    """
+                    UPDATE market SET shortname = ?,fullname = ?,description = ?,official_url = ?,created_at = ?,data_url = ? WHERE id = ?
+                    """,
+                    (market.short_name,market.full_name,market.description,market.official_url,market.created_at,market.data_url,int(existing_market[0]),)
+                )
         
-        self.__close_db__()
 
     def __remove_market__(self, market: MarketInformation):
         """
@@ -88,10 +168,8 @@ class DBManager():
         Args:
             market (MarketInformation): The market object to be deleted, identified by its shortname.
         """
-        self.__open_db__()
-        self.cursor.execute("DELETE FROM market WHERE shorname = ?",market.short_name)
-        self.conn.commit()
-        self.__close_db__()
+        with self.__transaction__() as cursor:
+            cursor.execute("DELETE FROM market WHERE shortname = ?",(market.short_name,))
         
 
     def __market_list__(self):
@@ -102,10 +180,9 @@ class DBManager():
             list[str]: A sorted list of market shortnames.
         """
         market_list = []
-        self.__open_db__()
-        self.cursor.execute("SELECT shortname FROM market ORDER BY shortname ASC")
-        rows = self.cursor.fetchall()
-        self.__close_db__()
+        with self.__transaction__() as cursor:
+            cursor.execute("SELECT shortname FROM market ORDER BY shortname ASC")
+            rows = cursor.fetchall()
         if rows:
             market_list = [market[0] for market in rows]
         return market_list
@@ -118,10 +195,9 @@ class DBManager():
             list[tuple]: A list of tuples containing market details:
                 (id, shortname, fullname, official_url, created_at).
         """
-        self.__open_db__()
-        self.cursor.execute("SELECT id, shortname,fullname,official_url,created_at FROM market ORDER BY shortname ASC")
-        rows = self.cursor.fetchall()
-        self.__close_db__()
+        with self.__transaction__() as cursor:
+            cursor.execute("SELECT id, shortname,fullname,official_url,created_at FROM market ORDER BY shortname ASC")
+            rows = cursor.fetchall()
         return rows
 
     def __add_tickers__(self, shortname: str, type: str, symbol: str, full_symbol: str, description: str, country: str):
@@ -139,33 +215,48 @@ class DBManager():
             description (str): A short description of the ticker.
             country (str): Country code where the ticker is listed.
         """
-        self.__open_db__()
-        self.cursor.execute("SELECT id FROM market WHERE shortname = ?",(shortname,))
-        market_obj = self.cursor.fetchone()
-        
-        if market_obj: # market exist
-            market_id = int(market_obj[0])
-            self.cursor.execute("SELECT t.id, t.symbol FROM ticker t JOIN market m ON m.id = t.market_id WHERE m.shortname = ? AND t.symbol = ?",(shortname,symbol,))
-            ticker_obj = self.cursor.fetchone()
+        self.__upsert_tickers__(shortname, [(type, symbol, full_symbol, description, country)])
+    
+    
+    def __upsert_tickers__(self, market_shortname: str, rows: list):
+        """
+        Add or update many tickers of a market in a single transaction.
+
+        Rows are written with one `executemany` relying on the UNIQUE (market_id, symbol)
+        index; tickers whose content did not change are left untouched.
+
+        Args:
+            market_shortname (str): Shortname of the associated market.
+            rows (list[tuple]): (type, symbol, full_symbol, description, country) rows.
+
+        Returns:
+            int: Number of tickers inserted or updated (0 if the market does not exist).
+        """
+        with __span__("db.upsert_tickers", rows=len(rows)), self.__transaction__() as cursor:
+            cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
+            market_obj = cursor.fetchone()
             
-            if ticker_obj == None:
-                self.cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO ticker (market_id,type,symbol,full_symbol,description,country) VALUES (?,?,?,?,?,?)
-                    """,
-                    (market_id,type,symbol,full_symbol,description,country,)
-                )
-            else:
-                ticker_id = int(ticker_obj[0])
-                self.cursor.execute(
-                    """
-                    UPDATE ticker SET market_id = ?, type = ?, symbol = ?,full_symbol = ?,description = ?,country = ? WHERE id = ?
-                    """,
-                    (market_id,type,symbol,full_symbol,description,country,ticker_id,)
-                )
-            # print("Database updated successfully.")
-            self.conn.commit()
-        self.__close_db__()
+            if market_obj is None:
+                return 0
+            
+            market_id = int(market_obj[0])
+            changes_before = cursor.connection.total_changes
+            cursor.executemany(
+                """
+                INSERT INTO ticker (market_id,type,symbol,full_symbol,description,country) VALUES (?,?,?,?,?,?)
+                ON CONFLICT(market_id, symbol) DO UPDATE SET
+                    type = excluded.type,
+                    full_symbol = excluded.full_symbol,
+                    description = excluded.description,
+                    country = excluded.country
+                WHERE ticker.type IS NOT excluded.type
+                    OR ticker.full_symbol IS NOT excluded.full_symbol
+                    OR ticker.description IS NOT excluded.description
+                    OR ticker.country IS NOT excluded.country
+                """,
+                [(market_id,) + tuple(row) for row in rows]
+            )
+            return cursor.connection.total_changes - changes_before
     
     
     def __get_tickers__(self, market_shortname: str):
@@ -179,20 +270,19 @@ class DBManager():
             list[tuple]: A list of tuples containing ticker details:
                 (id, market_id, symbol, full_symbol, description, country).
         """
-        self.__open_db__()
-        self.cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
-        market_obj = self.cursor.fetchone()
-        rows = None
+        with self.__transaction__() as cursor:
+            cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
+            market_obj = cursor.fetchone()
+            rows = None
         
-        if market_obj: # market exist
-            market_id = int(market_obj[0])
-            self.cursor.execute("""
-                SELECT id, market_id, symbol, full_symbol, description, country
-                FROM ticker WHERE market_id = ? ORDER BY symbol ASC
-            """, (market_id,))
-            rows = self.cursor.fetchall()
+            if market_obj: # market exist
+                market_id = int(market_obj[0])
+                cursor.execute("""
+                    SELECT id, market_id, symbol, full_symbol, description, country
+                    FROM ticker WHERE market_id = ? ORDER BY symbol ASC
+                """, (market_id,))
+                rows = cursor.fetchall()
             
-        self.__close_db__()
         return rows
 
     
@@ -207,28 +297,27 @@ class DBManager():
         Returns:
             list[str]: A sorted list of ticker symbols for the specified market.
         """
-        self.__open_db__()
-        ticker_list = []
-        self.cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
-        market_obj = self.cursor.fetchone()
+        with self.__transaction__() as cursor:
+            ticker_list = []
+            cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
+            market_obj = cursor.fetchone()
         
-        if market_obj != None: # market exist
-            market_id = int(market_obj[0])
+            if market_obj != None: # market exist
+                market_id = int(market_obj[0])
             
-            if type == "all":
-                self.cursor.execute(f"""
-                    SELECT symbol FROM ticker WHERE market_id = ? ORDER BY country ASC
-                """, (market_id,))
-            else:
-                self.cursor.execute(f"""
-                    SELECT symbol FROM ticker WHERE market_id = ? AND type = ? ORDER BY country ASC
-                """, (market_id,type,))
+                if type == "all":
+                    cursor.execute(f"""
+                        SELECT symbol FROM ticker WHERE market_id = ? ORDER BY country ASC
+                    """, (market_id,))
+                else:
+                    cursor.execute(f"""
+                        SELECT symbol FROM ticker WHERE market_id = ? AND type = ? ORDER BY country ASC
+                    """, (market_id,type,))
                 
-            rows = self.cursor.fetchall()
-            if rows:
-                ticker_list = [row[0] for row in rows]
+                rows = cursor.fetchall()
+                if rows:
+                    ticker_list = [row[0] for row in rows]
         
-        self.__close_db__()
         return ticker_list
     
     
@@ -242,37 +331,349 @@ class DBManager():
         Returns:
             list[str]: A sorted list of ticker symbols for the specified market.
         """
-        self.__open_db__()
-        ticker_list = []
-        self.cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
-        market_obj = self.cursor.fetchone()
+        with self.__transaction__() as cursor:
+            ticker_list = []
+            cursor.execute("SELECT id FROM market WHERE shortname = ?",(market_shortname,))
+            market_obj = cursor.fetchone()
         
-        if market_obj: # market exist
-            market_id = int(market_obj[0])
-            self.cursor.execute("""
-                SELECT full_symbol FROM ticker WHERE market_id = ? ORDER BY symbol ASC
-            """, (market_id,))
+            if market_obj: # market exist
+                market_id = int(market_obj[0])
+                cursor.execute("""
+                    SELECT full_symbol FROM ticker WHERE market_id = ? ORDER BY symbol ASC
+                """, (market_id,))
             
-            rows = self.cursor.fetchall()
-            if rows:
-                ticker_list = [row[0] for row in rows]
+                rows = cursor.fetchall()
+                if rows:
+                    ticker_list = [row[0] for row in rows]
         
-        self.__close_db__()
         return ticker_list
         
         
+    def __tickers_refreshed_at__(self, market_shortname: str):
+        """
+        Retrieve when the ticker list of a market was last downloaded.
+
+        Args:
+            market_shortname (str): Shortname of the market.
+
+        Returns:
+            datetime | None: Time of the last successful refresh, or None if never refreshed.
+        """
+        with self.__transaction__() as cursor:
+            cursor.execute("""
+                SELECT r.tickers_refreshed_at FROM market_refresh r JOIN market m ON m.id = r.market_id
+                WHERE m.shortname = ?
+            """, (market_shortname,))
+            row = cursor.fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    
+    def __set_tickers_refreshed_at__(self, market_shortname: str, refreshed_at: datetime = None):
+        """
+        Record that the ticker list of a market has just been downloaded.
+
+        Args:
+            market_shortname (str): Shortname of the market.
+            refreshed_at (datetime, optional): Time of the refresh. Default is now.
+        """
+        refreshed_at = refreshed_at or datetime.now()
+        with self.__transaction__() as cursor:
+            cursor.execute("""
+                INSERT INTO market_refresh (market_id, tickers_refreshed_at)
+                SELECT id, ? FROM market WHERE shortname = ?
+                ON CONFLICT(market_id) DO UPDATE SET tickers_refreshed_at = excluded.tickers_refreshed_at
+            """, (refreshed_at.isoformat(timespec="seconds"),market_shortname,))
+    
+    
+    def __get_validators__(self, url: str):
+        """
+        Retrieve the HTTP validators stored for a page.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            tuple: (etag, last_modified), each None if unknown.
+        """
+        with self.__transaction__() as cursor:
+            cursor.execute("SELECT etag, last_modified FROM http_validator WHERE url = ?",(url,))
+            row = cursor.fetchone()
+        return tuple(row) if row else (None, None)
+    
+    
+    def __set_validators__(self, url: str, etag: str = None, last_modified: str = None):
+        """
+        Store the `ETag` and `Last-Modified` validators of a page (removed when both are None).
+
+        Args:
+            url (str): URL of the page.
+            etag (str, optional): Value of the `ETag` response header.
+            last_modified (str, optional): Value of the `Last-Modified` response header.
+        """
+        with self.__transaction__() as cursor:
+            if etag is None and last_modified is None:
+                cursor.execute("DELETE FROM http_validator WHERE url = ?",(url,))
+            else:
+                cursor.execute("""
+                    INSERT INTO http_validator (url, etag, last_modified) VALUES (?,?,?)
+                    ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified
+                """, (url,etag,last_modified,))
+    
+    
+    def __ticker_id__(self, market_shortname: str, full_symbol: str):
+        """
+        Retrieve the id of a ticker from its native symbol.
+
+        Args:
+            market_shortname (str): Shortname of the market.
+            full_symbol (str): Native ticker symbol (e.g., "BOAB.bj").
+
+        Returns:
+            int | None: The ticker id, or None if the ticker is unknown.
+        """
+        with self.__transaction__() as cursor:
+            cursor.execute("SELECT t.id FROM ticker t JOIN market m ON m.id = t.market_id WHERE m.shortname = ? AND t.full_symbol = ?",(market_shortname,full_symbol,))
+            ticker_obj = cursor.fetchone()
+        return int(ticker_obj[0]) if ticker_obj else None
+    
+    
+    def __save_price_history__(self, market_shortname: str, full_symbol: str, period: str, rows: list, covered_ranges: list = [], replaced_ranges: list = ()):
+        """
+        Insert or replace OHLCV rows of a ticker and record the date ranges they cover.
+
+        Args:
+            market_shortname (str): Shortname of the market.
+            full_symbol (str): Native ticker symbol.
+            period (str): Data frequency ('daily', 'weekly', 'monthly', 'yearly').
+            rows (list[tuple]): (date, open, high, low, close, volume) rows, dates as 'YYYY-MM-DD'.
+            covered_ranges (list[tuple], optional): (start_date, end_date) ranges fully downloaded.
+                They are merged with the ranges already stored, so that later requests can skip them.
+            replaced_ranges (list[tuple], optional): (start_date, end_date) ranges downloaded again in
+                full: their stored rows are deleted first, since the bar of a period that was still
+                open may be dated differently now (e.g. by a later session of the same week).
+        """
+        ticker_id = self.__ticker_id__(market_shortname, full_symbol)
+        if ticker_id is None:
+            return
+        
+        with __span__("db.save_history", symbol=full_symbol, rows=len(rows)), self.__transaction__() as cursor:
+            cursor.executemany(
+                "DELETE FROM price_history WHERE ticker_id = ? AND period = ? AND date BETWEEN ? AND ?",
+                [(ticker_id, period, r[0], r[1]) for r in replaced_ranges]
+            )
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO price_history (ticker_id,period,date,open,high,low,close,volume) VALUES (?,?,?,?,?,?,?,?)
+                """,
+                [(ticker_id, period) + tuple(row) for row in rows]
+            )
+            if rows or replaced_ranges:
+                # copies of the history made before this write (columnar cache) are now out of date
+                cursor.execute("""
+                    INSERT INTO price_history_version (ticker_id,period,version) VALUES (?,?,1)
+                    ON CONFLICT (ticker_id,period) DO UPDATE SET version = version + 1
+                """, (ticker_id,period,))
+        
+            if covered_ranges:
+                cursor.execute("SELECT start_date, end_date FROM price_history_coverage WHERE ticker_id = ? AND period = ?",(ticker_id,period,))
+                merged = __merge_date_ranges__(cursor.fetchall() + [tuple(r) for r in covered_ranges])
+                cursor.execute("DELETE FROM price_history_coverage WHERE ticker_id = ? AND period = ?",(ticker_id,period,))
+                cursor.executemany(
+                    "INSERT INTO price_history_coverage (ticker_id,period,start_date,end_date) VALUES (?,?,?,?)",
+                    [(ticker_id, period, r[0], r[1]) for r in merged]
+                )
+    
+    
+    def __get_price_history__(self, market_shortname: str, full_symbol: str, period: str, start_date: str, end_date: str):
+        """
+        Retrieve stored OHLCV rows of a ticker between two dates (inclusive).
+
+        Returns:
+            list[tuple]: (date, open, high, low, close, volume) rows sorted by date.
+        """
+        with __span__("db.read_history", symbol=full_symbol) as span, self.__transaction__() as cursor:
+            cursor.execute("""
+                SELECT p.date, p.open, p.high, p.low, p.close, p.volume
+                FROM price_history p JOIN ticker t ON t.id = p.ticker_id JOIN market m ON m.id = t.market_id
+                WHERE m.shortname = ? AND t.full_symbol = ? AND p.period = ? AND p.date BETWEEN ? AND ?
+                ORDER BY p.date ASC
+            """, (market_shortname,full_symbol,period,start_date,end_date,))
+            rows = cursor.fetchall()
+            span.set(rows=len(rows))
+        return rows
+    
+    
+    def __query_price_history__(self, market_shortname: str, symbols: list = None, period: str = "daily",
+                                start_date: str = None, end_date: str = None, fields: list = PRICE_FIELDS,
+                                full_symbols: bool = False):
+        """
+        Retrieve only the requested fields of the stored rows of several tickers.
+
+        Every filter is applied by SQLite: each ticker is found through its (market, symbol)
+        index, then its rows through the (ticker_id, period, date) primary key, so a narrow
+        query reads only the matching rows whatever the size of the history.
+
+        Args:
+            market_shortname (str): Shortname of the market.
+            symbols (list[str], optional): Ticker symbols (e.g., ["BOAB", "SNTS"]). Default is every ticker.
+            period (str, optional): Data frequency. Default is 'daily'.
+            start_date (str, optional): First date ('YYYY-MM-DD'). Default is the first stored date.
+            end_date (str, optional): Last date ('YYYY-MM-DD'). Default is the last stored date.
+            fields (list[str], optional): Columns among `PRICE_FIELDS`. Default is all of them.
+            full_symbols (bool, optional): Label the rows with the native tickers (e.g., "BOAB.bj")
+                instead of the symbols.
+
+        Returns:
+            list[tuple]: (symbol, date, *fields) rows sorted by symbol and date.
+
+        Raises:
+            ValueError: If a field is unknown.
+        """
+        unknown = [field for field in fields if field not in PRICE_FIELDS]
+        if unknown:
+            raise ValueError(f"[Error] Unknown field(s) {unknown}; available fields are {list(PRICE_FIELDS)}.")
+
+        conditions = ["m.shortname = ?", "p.period = ?"]
+        parameters = [market_shortname, period]
+        if symbols is not None:
+            conditions.append(f"t.symbol IN ({','.join('?' * len(symbols))})")
+            parameters.extend(symbols)
+        if start_date is not None:
+            conditions.append("p.date >= ?")
+            parameters.append(start_date)
+        if end_date is not None:
+            conditions.append("p.date <= ?")
+            parameters.append(end_date)
+
+        # field names come from PRICE_FIELDS only
+        columns = "".join(f", p.{field}" for field in fields)
+        with __span__("db.query_history", symbols=len(symbols) if symbols is not None else None) as span, self.__transaction__() as cursor:
+            cursor.execute(f"""
+                SELECT {"t.full_symbol" if full_symbols else "t.symbol"}, p.date{columns}
+                FROM market m JOIN ticker t ON t.market_id = m.id JOIN price_history p ON p.ticker_id = t.id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY t.symbol ASC, p.date ASC
+            """, parameters)
+            rows = cursor.fetchall()
+            span.set(rows=len(rows))
+        return rows
+
+
+    def __history_version__(self, market_shortname: str, full_symbol: str, period: str):
+        """
+        Retrieve the version of a ticker's stored history, incremented by every write of its rows.
+
+        Returns:
+            int: The version (0 if nothing was ever written).
+        """
+        with self.__transaction__() as cursor:
+            cursor.execute("""
+                SELECT v.version
+                FROM price_history_version v JOIN ticker t ON t.id = v.ticker_id JOIN market m ON m.id = t.market_id
+                WHERE m.shortname = ? AND t.full_symbol = ? AND v.period = ?
+            """, (market_shortname,full_symbol,period,))
+            version = cursor.fetchone()
+        return version[0] if version else 0
+    
+    
+    def __covered_ranges__(self, market_shortname: str, full_symbol: str, period: str, start_date: str, end_date: str):
+        """
+        Retrieve the downloaded date ranges of a ticker that overlap [start_date, end_date].
+
+        Returns:
+            list[tuple]: Disjoint (start_date, end_date) ranges in chronological order.
+        """
+        ticker_id = self.__ticker_id__(market_shortname, full_symbol)
+        if ticker_id is None:
+            return []
+        
+        with __span__("db.coverage", symbol=full_symbol), self.__transaction__() as cursor:
+            cursor.execute("""
+                SELECT start_date, end_date FROM price_history_coverage
+                WHERE ticker_id = ? AND period = ? AND end_date >= ? AND start_date <= ?
+                ORDER BY start_date ASC
+            """, (ticker_id,period,start_date,end_date,))
+            covered = __merge_date_ranges__(cursor.fetchall())
+        return covered
+    
+    
+    def __missing_ranges__(self, market_shortname: str, full_symbol: str, period: str, start_date: str, end_date: str):
+        """
+        Compute the parts of [start_date, end_date] that have never been downloaded for a ticker.
+
+        Returns:
+            list[tuple]: (start_date, end_date) ranges still to be requested, in chronological order.
+        """
+        covered = self.__covered_ranges__(market_shortname, full_symbol, period, start_date, end_date)
+        return __subtract_ranges__(start_date, end_date, covered)
+    
+    
     def __open_db__(self):
         """
-        Open a connection to the SQLite database and initialize the cursor.
+        Return the SQLite connection of the current thread, opening it on first use.
+
+        Connections are kept open for the lifetime of the thread and shared by every
+        DBManager of that thread, so that each call does not pay the connection setup.
+        WAL journaling lets readers and a writer work on the database at the same time.
+
+        Returns:
+            sqlite3.Connection: The connection of the current thread.
         """
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        connections = _local.__dict__.setdefault("connections", {})
+        conn = connections.get(self.db_path)
+        
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -16000")
+            conn.execute("PRAGMA busy_timeout = 30000")
+            connections[self.db_path] = conn
+        
+        # the schema is created once per database file and per process
+        if self.db_path not in _schema_ready:
+            with _schema_lock:
+                if self.db_path not in _schema_ready:
+                    self.__create_schema__(conn)
+                    _schema_ready.add(self.db_path)
+        return conn
         
     def __close_db__(self):
         """
-        Close the current connection to the SQLite database.
+        Close the SQLite connection of the current thread (it is reopened on next use).
+        """
+        connections = _local.__dict__.get("connections", {})
+        conn = connections.pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
+    
+    @contextmanager
+    def __transaction__(self):
+        """
+        Run a short transaction on the connection of the current thread.
+
+        The transaction is committed when the block exits normally and rolled back if it
+        raises. Nested blocks join the outermost transaction.
+
+        Yields:
+            sqlite3.Cursor: A cursor on the connection of the current thread.
         """
-        self.conn.close()
+        conn = self.__open_db__()
+        depth = _local.__dict__.setdefault("depth", {})
+        depth[self.db_path] = depth.get(self.db_path, 0) + 1
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            if depth[self.db_path] == 1:
+                conn.commit()
+        except Exception:
+            if depth[self.db_path] == 1:
+                conn.rollback()
+            raise
+        finally:
+            depth[self.db_path] -= 1
+            cursor.close()
         
     def __delete_table__(self, tables: list):
         """
@@ -281,9 +682,30 @@ class DBManager():
         Args:
             tables (list[str]): List of table names to be cleared.
         """
-        self.__open_db__()
-        for tab in tables:
-            self.cursor.execute(f"DROP TABLE {tab}")
-        self.conn.commit()
-        self.__close_db__()
+        with self.__transaction__() as cursor:
+            for tab in tables:
+                cursor.execute(f"DROP TABLE {tab}")
+        # recreate the dropped tables with the next DBManager
+        _schema_ready.discard(self.db_path)
         
+
+
+def __merge_date_ranges__(ranges):
+    """
+    Merge overlapping or adjacent (start_date, end_date) ranges ('YYYY-MM-DD').
+
+    Args:
+        ranges (list[tuple]): Ranges to merge, in any order.
+
+    Returns:
+        list[tuple]: Disjoint ranges sorted by start date.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged:
+            previous_end = datetime.strptime(merged[-1][1],"%Y-%m-%d").date()
+            if datetime.strptime(start,"%Y-%m-%d").date() <= previous_end + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+                continue
+        merged.append((start, end))
+    return merged
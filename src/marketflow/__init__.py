@@ -1,6 +1,35 @@
-from .market_registry import MarketRegistry
-from .market_information import MarketInformation
-from .market_ticker import MarketTickers
-from .market_data import MarketData
+"""
+MarketFlow: access to African, American, European and Asian market data.
 
-__all__ = ["MarketData", "MarketTickers", "MarketRegistry","MarketInformation"]
\ No newline at end of file
+The public classes are imported on first access, so that `import marketflow` stays
+fast and does not load pandas, requests or BeautifulSoup, nor touch the local
+database or the network.
+"""
+
+import importlib
+
+__lazy_attributes__ = {
+    "MarketRegistry": "marketflow.market_registry",
+    "MarketInformation": "marketflow.market_information",
+    "MarketTickers": "marketflow.market_ticker",
+    "MarketData": "marketflow.market_data",
+    "MarketMetrics": "marketflow.market_metrics",
+    "MarketAnalytics": "marketflow.analytics",
+    "MarketRefresher": "marketflow.market_refresher",
+    "configure_http": "marketflow.__marketconfig__.__http_client__",
+    "register_market": "marketflow.market_plugins",
+}
+
+__all__ = ["MarketData", "MarketTickers", "MarketRegistry","MarketInformation","MarketMetrics","MarketAnalytics","MarketRefresher","configure_http","register_market"]
+
+
+def __getattr__(name):
+    if name in __lazy_attributes__:
+        value = getattr(importlib.import_module(__lazy_attributes__[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'marketflow' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
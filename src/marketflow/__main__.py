@@ -0,0 +1,7 @@
+"""
+`python -m marketflow`: same as the `marketflow` console command.
+"""
+
+from marketflow.market_cli import main
+
+raise SystemExit(main())
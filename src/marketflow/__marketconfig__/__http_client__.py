@@ -0,0 +1,301 @@
+"""
+Shared HTTP client used by every market extractor.
+
+All requests go through a single `requests.Session` so that TCP/TLS connections are
+kept alive and reused between calls (and between threads), with the same timeout,
+retry policy and (optional) per-host rate limit everywhere.
+
+Responses of the data endpoints can also be kept in a disk cache (see `configure_http`),
+so that re-running the same extraction does not send any request.
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from marketflow.market_metrics import __span__, __count__
+from marketflow.__marketconfig__.__scheduler__ import TokenBucket
+
+
+HTTP_CONFIG = {
+    "pool_size": 10,            # connections kept alive per host
+    "timeout": (5, 30),         # (connect, read) timeout in seconds
+    "retries": 3,               # retries on 5xx and connection resets
+    "backoff_factor": 0.5,      # waits 0.5s, 1s, 2s, ... between retries
+    "rate_limit": None,         # requests per second and per host (None: unlimited)
+    "burst": 4,                 # requests allowed at once above the rate limit
+    "max_attempts": 3,          # tries of a download window before it is given up for this run
+    "requeue_backoff": 2.0,     # waits 2s, 4s, ... before a failed window is tried again
+    # disk cache of the data responses (None: disabled)
+    "response_cache_dir": os.environ.get("MARKETFLOW_RESPONSE_CACHE") or None,
+    "response_cache_size": 512 * 1024 * 1024,   # bytes kept before the least recently used responses are evicted
+    "response_cache_ttl": 900,                  # seconds a response that may still change is reused
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+_buckets = {}
+_response_cache = None
+
+
+def configure_http(pool_size: int = None, timeout=None, retries: int = None, backoff_factor: float = None,
+                   rate_limit: float = None, burst: int = None, max_attempts: int = None, requeue_backoff: float = None,
+                   response_cache_dir: str = None, response_cache_size: int = None, response_cache_ttl: float = None):
+    """
+    Change the settings of the shared HTTP session.
+
+    The session is rebuilt on the next request with the new settings.
+
+    Args:
+        pool_size (int, optional): Number of keep-alive connections per host.
+        timeout (float | tuple, optional): Timeout in seconds, or a (connect, read) tuple.
+        retries (int, optional): Number of retries on 429/5xx responses and connection errors.
+        backoff_factor (float, optional): Exponential backoff factor between retries.
+        rate_limit (float, optional): Maximum requests per second sent to one host
+            (token bucket shared by every thread); 0 removes the limit.
+        burst (int, optional): Number of requests that may be sent at once above the rate limit.
+        max_attempts (int, optional): Number of tries of a download window; a window that
+            still fails is requested again on the next call.
+        requeue_backoff (float, optional): Delay before a failed window is tried again, doubled
+            after each failure; the other windows keep downloading meanwhile.
+        response_cache_dir (str, optional): Directory of the disk cache of the data responses
+            (also read from the `MARKETFLOW_RESPONSE_CACHE` environment variable); "" disables it.
+            A window that ends before today is reused until evicted, a window reaching
+            today for `response_cache_ttl` seconds.
+        response_cache_size (int, optional): Maximum size of the response cache in bytes; the
+            least recently used responses are evicted above it.
+        response_cache_ttl (float, optional): Lifetime in seconds of a cached response that may still change.
+    """
+    global _session, _response_cache
+
+    with _session_lock:
+        if pool_size is not None:
+            HTTP_CONFIG["pool_size"] = pool_size
+        if timeout is not None:
+            HTTP_CONFIG["timeout"] = timeout
+        if retries is not None:
+            HTTP_CONFIG["retries"] = retries
+        if backoff_factor is not None:
+            HTTP_CONFIG["backoff_factor"] = backoff_factor
+        if rate_limit is not None:
+            HTTP_CONFIG["rate_limit"] = rate_limit or None
+        if burst is not None:
+            HTTP_CONFIG["burst"] = burst
+        if max_attempts is not None:
+            HTTP_CONFIG["max_attempts"] = max_attempts
+        if requeue_backoff is not None:
+            HTTP_CONFIG["requeue_backoff"] = requeue_backoff
+        if response_cache_dir is not None:
+            HTTP_CONFIG["response_cache_dir"] = response_cache_dir or None
+        if response_cache_size is not None:
+            HTTP_CONFIG["response_cache_size"] = response_cache_size
+        if response_cache_ttl is not None:
+            HTTP_CONFIG["response_cache_ttl"] = response_cache_ttl
+
+        _buckets.clear()
+        _response_cache = None
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def __bucket__(url: str):
+    """
+    Return the token bucket of the host of `url`, or None when no rate limit is set.
+    """
+    if not HTTP_CONFIG["rate_limit"]:
+        return None
+    host = urlsplit(url).netloc
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _session_lock:
+            bucket = _buckets.setdefault(host, TokenBucket(HTTP_CONFIG["rate_limit"], HTTP_CONFIG["burst"]))
+    return bucket
+
+
+def __get_response_cache__():
+    """
+    Return the disk cache of the data responses, or None when it is disabled.
+
+    Returns:
+        ResponseCache | None: The cache, created on first use.
+    """
+    global _response_cache
+
+    if _response_cache is None and HTTP_CONFIG["response_cache_dir"]:
+        from marketflow.__response_cache__ import ResponseCache
+
+        with _session_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    HTTP_CONFIG["response_cache_dir"],
+                    max_bytes=HTTP_CONFIG["response_cache_size"],
+                    ttl=HTTP_CONFIG["response_cache_ttl"]
+                )
+    return _response_cache
+
+
+def __new_adapter__():
+    """
+    Build a pooled adapter with the retry policy, sized after `HTTP_CONFIG["pool_size"]`.
+    """
+    retry = Retry(
+        total=HTTP_CONFIG["retries"],
+        connect=HTTP_CONFIG["retries"],
+        read=HTTP_CONFIG["retries"],
+        status=HTTP_CONFIG["retries"],
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "POST"]),   # GetHistos is a read-only POST
+        backoff_factor=HTTP_CONFIG["backoff_factor"],
+        raise_on_status=False
+    )
+    return HTTPAdapter(
+        pool_connections=HTTP_CONFIG["pool_size"],
+        pool_maxsize=HTTP_CONFIG["pool_size"],
+        max_retries=retry
+    )
+
+
+def __get_session__():
+    """
+    Return the shared session, creating it on first use.
+
+    Returns:
+        requests.Session: Session with a pooled adapter and the retry policy mounted.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = __new_adapter__()
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate"})
+                _session = session
+    return _session
+
+
+def __ensure_pool_size__(size: int):
+    """
+    Grow the connection pool so that `size` concurrent requests can all keep their connection alive.
+
+    The shared session, the rate limiters and the response cache are kept: a larger adapter
+    is swapped in for the next requests, while the ones in flight finish on the former pool.
+    """
+    if size is None or size <= HTTP_CONFIG["pool_size"]:
+        return
+    with _session_lock:
+        if size <= HTTP_CONFIG["pool_size"]:
+            return
+        HTTP_CONFIG["pool_size"] = size
+        if _session is not None:
+            adapter = __new_adapter__()
+            # a new mapping assigned at once: threads looking up an adapter never see it half updated
+            adapters = _session.adapters.copy()
+            adapters["https://"] = adapter
+            adapters["http://"] = adapter
+            _session.adapters = adapters
+
+
+def __get__(url: str, **kwargs):
+    """
+    Send a GET request through the shared session (default timeout applied).
+    """
+    return __request__("GET", url, **kwargs)
+
+
+def __post__(url: str, **kwargs):
+    """
+    Send a POST request through the shared session (default timeout applied).
+    """
+    return __request__("POST", url, **kwargs)
+
+
+def __request__(method: str, url: str, **kwargs):
+    """
+    Send a request through the shared session, reporting its duration, size and retries
+    to the active metrics collectors.
+    """
+    kwargs.setdefault("timeout", HTTP_CONFIG["timeout"])
+    bucket = __bucket__(url)
+    if bucket is not None:
+        with __span__("http.throttle", url=url):
+            bucket.acquire()
+    with __span__("http." + method.lower(), url=url) as span:
+        response = __get_session__().request(method, url, **kwargs)
+        retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        span.set(status=response.status_code, bytes=len(response.content), retries=len(retries))
+    __count__("http.requests")
+    __count__("http.bytes", len(response.content))
+    if retries:
+        __count__("http.retries", len(retries))
+    return response
+
+
+def __async_client__():
+    """
+    Create a non-blocking HTTP client with the same pool size and timeout as the shared session.
+
+    The client must be used as `async with __async_client__() as client:` inside the
+    running event loop; all the requests of one call share its connection pool.
+
+    Returns:
+        httpx.AsyncClient: The client.
+
+    Raises:
+        ImportError: If the optional `httpx` dependency is not installed.
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("The asyncio interface needs httpx: pip install marketflow[async]")
+
+    timeout = HTTP_CONFIG["timeout"]
+    if isinstance(timeout, tuple):
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=HTTP_CONFIG["pool_size"], max_keepalive_connections=HTTP_CONFIG["pool_size"]),
+        headers={"Accept-Encoding": "gzip, deflate"},
+        follow_redirects=True
+    )
+
+
+async def __arequest__(client, method: str, url: str, **kwargs):
+    """
+    Send a request with an async client, retrying 5xx responses and connection errors
+    with the same exponential backoff as the shared session.
+
+    Returns:
+        httpx.Response: The last response received.
+    """
+    import asyncio
+    import httpx
+
+    attempt = 0
+    with __span__("http." + method.lower(), url=url) as span:
+        while True:
+            try:
+                bucket = __bucket__(url)
+                if bucket is not None:
+                    await bucket.aacquire()
+                response = await client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS or attempt >= HTTP_CONFIG["retries"]:
+                    break
+            except httpx.TransportError:
+                if attempt >= HTTP_CONFIG["retries"]:
+                    raise
+            await asyncio.sleep(HTTP_CONFIG["backoff_factor"] * (2 ** attempt))
+            attempt += 1
+        span.set(status=response.status_code, bytes=len(response.content), retries=attempt)
+    __count__("http.requests")
+    __count__("http.bytes", len(response.content))
+    if attempt:
+        __count__("http.retries", attempt)
+    return response
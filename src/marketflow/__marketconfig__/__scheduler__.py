@@ -0,0 +1,234 @@
+"""
+Request scheduling shared by the market extractors.
+
+    - `TokenBucket` caps the request rate sent to one host (with a small burst),
+    - `JobScheduler` runs (symbol, window) jobs by priority on a bounded pool of
+      workers, puts failed jobs back in the queue after an exponential backoff and
+      reports the progress of the run.
+
+Together they keep bulk downloads at the highest rate a source tolerates without
+losing windows to throttling or dropped requests.
+"""
+
+import contextvars
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from marketflow.market_metrics import __count__
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket: `rate` tokens per second, at most `burst` kept in reserve.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (int): Capacity of the bucket.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __reserve__(self):
+        """
+        Take one token and return how long the caller must wait before using it (seconds).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available.
+        """
+        delay = self.__reserve__()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self):
+        """
+        Wait for a token without blocking the event loop.
+        """
+        import asyncio
+
+        delay = self.__reserve__()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class JobScheduler:
+    """
+    Run jobs by priority, retrying failed ones after a backoff, and report progress.
+
+    A job fails when `func(job)` returns None or raises. It is then put back in the
+    queue, to be run again after `backoff * 2 ** (attempt - 1)` seconds (with jitter),
+    until it has been tried `max_attempts` times. Meanwhile the workers keep running
+    the other jobs.
+
+    Attributes:
+        func (callable): Function run for each job; None means failure.
+        max_workers (int): Number of concurrent workers (1 runs the jobs in the calling thread).
+        max_attempts (int): Maximum number of tries of a job.
+        backoff (float): Base delay before a failed job is tried again, in seconds.
+        progress (callable | None): Called with a dict (done, failed, retried, total) each
+            time a job finishes for good.
+    """
+
+    def __init__(self, func, max_workers: int = 1, max_attempts: int = 3, backoff: float = 1.0, progress = None):
+        self.func = func
+        self.max_workers = max(1, max_workers or 1)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.progress = progress
+
+    def run(self, jobs, priorities = None):
+        """
+        Run every job and yield each result as soon as it is final.
+
+        Args:
+            jobs (list): Jobs to run.
+            priorities (list, optional): Priority of each job, lowest first. Default is the job order.
+
+        Yields:
+            tuple: (job, result) pairs; result is None for a job that failed every attempt.
+        """
+        if priorities is None:
+            priorities = range(len(jobs))
+        sequence = itertools.count()
+        # ready jobs: (priority, seq, attempt, job); delayed jobs: (not_before, priority, seq, attempt, job)
+        self._ready = [(priority, next(sequence), 1, job) for priority, job in zip(priorities, jobs)]
+        heapq.heapify(self._ready)
+        self._delayed = []
+        self._sequence = sequence
+        self._stats = {"done": 0, "failed": 0, "retried": 0, "total": len(jobs)}
+        self._stop = False
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+        if not jobs:
+            return
+        if self.max_workers == 1 or len(jobs) == 1:
+            yield from self.__run_inline__()
+        else:
+            yield from self.__run_threads__()
+
+    def __next_job__(self):
+        """
+        Pop the next runnable job, waiting for a delayed one if needed (lock held).
+
+        Returns:
+            tuple | None: (priority, seq, attempt, job), or None when nothing is left to run.
+        """
+        while not self._stop:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, priority, seq, attempt, job = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (priority, seq, attempt, job))
+            if self._ready:
+                return heapq.heappop(self._ready)
+            if self._delayed:
+                self._cond.wait(self._delayed[0][0] - now)
+            elif self._in_flight:
+                # a running job may still be requeued
+                self._cond.wait()
+            else:
+                return None
+        return None
+
+    def __try_job__(self, job):
+        """
+        Run one try of a job; an exception counts as a failure.
+        """
+        try:
+            return self.func(job)
+        except Exception:
+            return None
+
+    def __finish__(self, entry, result):
+        """
+        Record the outcome of one try (lock held): requeue a failed job or count it as done.
+
+        Returns:
+            dict | None: A snapshot of the progress when the job is final, None if it was requeued.
+        """
+        priority, _, attempt, job = entry
+        if result is None and attempt < self.max_attempts:
+            delay = self.backoff * (2 ** (attempt - 1)) * random.uniform(0.75, 1.25)
+            heapq.heappush(self._delayed, (time.monotonic() + delay, priority, next(self._sequence), attempt + 1, job))
+            self._stats["retried"] += 1
+            __count__("windows.requeued")
+            return None
+
+        self._stats["done"] += 1
+        if result is None:
+            self._stats["failed"] += 1
+        return dict(self._stats)
+
+    def __report__(self, stats):
+        if self.progress is not None:
+            try:
+                self.progress(stats)
+            except Exception:
+                # a failing callback must never break a download
+                pass
+
+    def __run_inline__(self):
+        while True:
+            with self._cond:
+                entry = self.__next_job__()
+            if entry is None:
+                return
+            result = self.__try_job__(entry[3])
+            with self._cond:
+                stats = self.__finish__(entry, result)
+            if stats is not None:
+                self.__report__(stats)
+                yield entry[3], result
+
+    def __run_threads__(self):
+        results = queue.Queue()
+
+        def worker():
+            while True:
+                with self._cond:
+                    entry = self.__next_job__()
+                    if entry is None:
+                        self._cond.notify_all()
+                        return
+                    self._in_flight += 1
+                result = self.__try_job__(entry[3])
+                with self._cond:
+                    self._in_flight -= 1
+                    stats = self.__finish__(entry, result)
+                    self._cond.notify_all()
+                if stats is not None:
+                    self.__report__(stats)
+                    results.put((entry[3], result))
+
+        # each worker runs in a copy of the caller's context, so that its metrics collectors follow the jobs
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(worker,), daemon=True)
+                   for _ in range(min(self.max_workers, self._stats["total"]))]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(self._stats["total"]):
+                yield results.get()
+        finally:
+            # the consumer may stop early: let the workers finish their current job and exit
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            for thread in threads:
+                thread.join()
@@ -1,22 +1,41 @@
 from marketflow.market_registry import MarketRegistry
 from marketflow.market_ticker import MarketTickers
 from marketflow.__db_manager__ import DBManager
-from bs4 import BeautifulSoup
-from datetime import datetime,timedelta
-from tabulate import tabulate
-import requests
+from datetime import datetime,timedelta,timezone
+import json
+import os
+import random
 import pandas as pd
+from marketflow.__marketconfig__ import __http_client__
+from marketflow.__marketconfig__.__scheduler__ import JobScheduler
+from marketflow.market_metrics import __span__, __count__
+from marketflow.__window_planner__ import __plan_windows__, __split_windows__
+from marketflow.__output_backends__ import __check_output__, __price_output__
 
 db_manager = DBManager()
 
+# MARKETFLOW_SIKAFINANCE_URL points the extractor to a mirror or a local stand-in server
+SIKAFINANCE_URL = os.environ.get("MARKETFLOW_SIKAFINANCE_URL", "https://www.sikafinance.com").rstrip("/")
+HISTOS_URL = SIKAFINANCE_URL + "/api/general/GetHistos"
+
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+OHLCV_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+# BRVM sessions close at 15:00 GMT: the bars of a day are final once published, shortly after
+SESSION_SETTLED_UTC = (15, 30)
+
+# pandas period of each coarser frequency derived locally from daily bars
+# weeks end on Friday, the last session of the week (same Monday-Friday groups as "W")
+RESAMPLE_PERIODS = {"daily": None, "weekly": "W-FRI", "monthly": "M", "yearly": "Y"}
+
 class MarketDataOutput:
     """
     A container class for storing and displaying extracted market data.
 
     Attributes:
         market (str): The shortname of the market.
-        by_row (pd.DataFrame): Extracted data organized by rows.
-        by_col (pd.DataFrame): Extracted data organized by columns.
+        by_row (pd.DataFrame): Extracted data organized by rows (`Date` index, categorical `Ticker` column).
+        by_col (pd.DataFrame): Extracted data organized by columns (`Date` index, one `SYMBOL.Field` column each).
     """
 
     def __init__(self,market,by_row,by_col):
@@ -48,35 +67,243 @@ class MarketDataOutput:
 
 
 
-def __get_brvm_data__(market_shortname="BRVM",
-                    symbols ="all",
-                    period: str = 'daily',
-                    start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
-                    end_date=datetime.today().strftime("%Y-%m-%d")):
+def __fetch_window__(url, full_symbol, row_period, frequency, refresh=False):
     """
-    Extract historical data for BRVM tickers using the SikaFinance API.
+    Download one (symbol, window) chunk from the SikaFinance GetHistos endpoint.
+
+    The response cache (see `configure_http`) is read first and filled with every
+    successful response.
 
     Args:
-        market_shortname (str, optional): Market shortname, default is "BRVM".
-        symbols (list[str], optional): List of ticker symbols to extract data for.
-        period (str, optional): Frequency of data ('daily', 'weekly', 'monthly', 'yearly').
-        start_date (str, optional): Start date of the extraction period ('YYYY-MM-DD').
-        end_date (str, optional): End date of the extraction period ('YYYY-MM-DD').
+        url (str): GetHistos endpoint.
+        full_symbol (str): Native ticker symbol (e.g., "BOAB.bj").
+        row_period (tuple[str]): (datedeb, datefin) window.
+        frequency (str): SikaFinance `xperiod` code.
+        refresh (bool, optional): Skip the cached response and replace it with the downloaded one.
 
     Returns:
-        MarketDataOutput: Object containing extracted data as two DataFrames:
-            - by_row: Data organized with one row per observation.
-            - by_col: Data organized with one column per ticker.
+        list[tuple] | None: (date, open, high, low, close, volume) rows, an empty list when the
+            API has no data for the window, or None if the request failed.
+    """
+    body = __histos_body__(full_symbol, row_period, frequency)
+    rows = None if refresh else __read_response__(url, body)
+    if rows is not None:
+        return rows
 
-    Raises:
-        ValueError: If the market or period is not supported, or if the date range is invalid.
+    try:
+        response = __http_client__.__post__(url, json = body)
+    except Exception:
+        # retries exhausted: the window stays missing and is requested again next time
+        __count__("windows.failed")
+        return None
+    
+    if response.status_code == 200:
+        rows = __decode_histos__(response.content)
+        __write_response__(url, body, response.content)
+        return rows
+    __count__("windows.failed")
+    return None
+
+
+async def __afetch_window__(client, semaphore, full_symbol, row_period, frequency, stats=None, refresh=False):
     """
+    Awaitable counterpart of `__fetch_window__`, limited by `semaphore`.
+
+    A failed window is tried again after a backoff (see `configure_http`), without
+    holding a slot of the semaphore while it waits.
+
+    Returns:
+        list[tuple] | None: Same as `__fetch_window__`.
+    """
+    import asyncio
     
-    url = "https://www.sikafinance.com/api/general/GetHistos"
-    all_dataframe_row = None
-    all_dataframe_col = None
-    all_dataframes = None
+    body = __histos_body__(full_symbol, row_period, frequency)
+    rows = None if refresh else __read_response__(HISTOS_URL, body)
+    if rows is not None:
+        return rows
+
+    max_attempts = max(1, __http_client__.HTTP_CONFIG["max_attempts"])
+    for attempt in range(1, max_attempts + 1):
+        rows = None
+        async with semaphore:
+            try:
+                response = await __http_client__.__arequest__(client, "POST", HISTOS_URL, json = body)
+                if response.status_code == 200:
+                    rows = __decode_histos__(response.content)
+                    __write_response__(HISTOS_URL, body, response.content)
+            except Exception:
+                rows = None
+        
+        if rows is not None:
+            return rows
+        __count__("windows.failed")
+        if attempt < max_attempts:
+            if stats is not None:
+                stats["retried"] += 1
+            __count__("windows.requeued")
+            await asyncio.sleep(__http_client__.HTTP_CONFIG["requeue_backoff"] * (2 ** (attempt - 1)) * random.uniform(0.75, 1.25))
+    return None
+
+
+def __histos_body__(full_symbol, row_period, frequency):
+    """
+    Build the GetHistos request body of one (symbol, window) chunk.
+    """
+    return {
+        "ticker": full_symbol,
+        "datedeb": row_period[0],
+        "datefin": row_period[1],
+        "xperiod": frequency
+    }
+
+
+def __read_response__(url, body):
+    """
+    Decode the cached response of a GetHistos request.
+
+    Returns:
+        list[tuple] | None: Same as `__decode_histos__`, or None if the response is not cached.
+    """
+    response_cache = __http_client__.__get_response_cache__()
+    if response_cache is None:
+        return None
+    with __span__("responses.read"):
+        payload = response_cache.__read__(url, body)
+    if payload is None:
+        __count__("responses.misses")
+        return None
+    try:
+        rows = __decode_histos__(payload)
+    except ValueError:
+        # corrupted entry: download the window again
+        __count__("responses.misses")
+        return None
+    __count__("responses.hits")
+    return rows
+
+
+def __write_response__(url, body, payload):
+    """
+    Cache the payload of a successful GetHistos request.
+
+    A window that ends before today will not change anymore and is kept until evicted;
+    a window reaching today expires after the TTL of the cache.
+    """
+    response_cache = __http_client__.__get_response_cache__()
+    if response_cache is None:
+        return
+    try:
+        with __span__("responses.write", bytes=len(payload)):
+            response_cache.__write__(url, body, payload, permanent=body["datefin"] < datetime.today().strftime("%Y-%m-%d"))
+    except OSError:
+        # the cache is an optimization: a full or read-only disk must not fail the download
+        pass
+
+
+def __decode_histos__(payload):
+    """
+    Decode the payload of a successful GetHistos response into OHLCV rows.
+
+    Args:
+        payload (bytes): Body of the response (JSON).
+
+    Returns:
+        list[tuple]: (date, open, high, low, close, volume) rows, empty when the API has no data.
+    """
+    with __span__("parse.histos") as span:
+        data_json = json.loads(payload)
+        
+        if 'error' in data_json and data_json['error'] == 'nodata':
+            return []
+        # ici selon la structure réelle de l'API, souvent data_json['lst'] ou data_json['Data']
+        rows = __parse_histos__(data_json.get('lst', []))
+        span.set(rows=len(rows))
+    return rows
+
+
+def __parse_histos__(lst):
+    """
+    Convert the `lst` payload of GetHistos into OHLCV rows.
+
+    Field names are matched case-insensitively and dates are converted to 'YYYY-MM-DD'.
+
+    Args:
+        lst (list[dict]): Raw observations returned by the API.
+
+    Returns:
+        list[tuple]: (date, open, high, low, close, volume) rows.
+    """
+    rows = []
+    for item in lst:
+        item = {key.lower(): value for key, value in item.items()}
+        rows.append((__iso_date__(item.get("date")),) + tuple(item.get(field) for field in OHLCV_FIELDS))
+    return rows
+
+
+def __iso_date__(value):
+    """
+    Normalize a date returned by the API ('DD/MM/YYYY', 'YYYY-MM-DD' or ISO datetime) to 'YYYY-MM-DD'.
+    """
+    for date_format in ("%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(str(value), date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return str(value)
+
+
+def __iter_jobs__(url, jobs, frequency, max_workers=1, progress=None, refresh=False):
+    """
+    Run every planned (symbol, window) job and yield each chunk as soon as it is downloaded.
+
+    Jobs go through a `JobScheduler` with an explicit priority: symbols in request order
+    (so that each one completes, and is streamed, as early as possible), and within a
+    symbol the window closest to today first. A failed window is put back in the queue
+    and tried again after a backoff, up to `max_attempts` tries (see `configure_http`).
+
+    Args:
+        url (str): GetHistos endpoint.
+        jobs (list[tuple]): (symbol, full_symbol, (datedeb, datefin), missing_range) jobs.
+        frequency (str): SikaFinance `xperiod` code.
+        max_workers (int, optional): Number of concurrent downloads. 1 keeps the sequential path.
+        progress (callable, optional): Called with a dict (done, failed, retried, total) after each window.
+        refresh (bool, optional): Download every window again, even if its response is cached.
+
+    Yields:
+        tuple: (job, rows) pairs; job order with `max_workers=1` (unless a window is retried),
+            completion order otherwise. rows is None for a window that failed every try.
+    """
+    fetch = lambda job: __fetch_window__(url, job[1], job[2], frequency, refresh)
+    today = datetime.today().date()
+    rank = {symbol: i for i, symbol in enumerate(dict.fromkeys(job[0] for job in jobs))}
+    priorities = [(rank[job[0]], (today - datetime.strptime(job[2][1], "%Y-%m-%d").date()).days) for job in jobs]
     
+    if max_workers is not None and max_workers > 1:
+        __http_client__.__ensure_pool_size__(max_workers)
+    scheduler = JobScheduler(
+        fetch,
+        max_workers=max_workers,
+        max_attempts=__http_client__.HTTP_CONFIG["max_attempts"],
+        backoff=__http_client__.HTTP_CONFIG["requeue_backoff"],
+        progress=progress
+    )
+    yield from scheduler.run(jobs, priorities)
+
+
+def __resolve_request__(market_shortname, symbols, period, start_date, end_date, refresh_tickers=True):
+    """
+    Validate a data request and map the requested symbols to their native tickers.
+
+    With `refresh_tickers=False` the stored ticker list is used as is, even if stale
+    (the caller has already refreshed it).
+
+    Returns:
+        tuple: (frequency, full_symbols) where full_symbols maps each available requested
+            symbol to its native ticker, in request order.
+
+    Raises:
+        ValueError: If the market or period is not supported, or if the date range is invalid.
+    """
     registry_obj = MarketRegistry()
     ticker_obj = MarketTickers()
     
@@ -85,8 +312,11 @@ def __get_brvm_data__(market_shortname="BRVM",
     real_ticker_list = []
     
     if market_shortname in market_list:
-        ticker_obj.getTickers(market=market_shortname)
-        real_ticker_list = ticker_obj.__full_ticker_list__(market_shortname)
+        # the ticker universe is scraped again only when the stored one is stale
+        if refresh_tickers:
+            real_ticker_list = ticker_obj.__full_ticker_list__(market_shortname)
+        else:
+            real_ticker_list = db_manager.__full_version_ticker_list__(market_shortname)
     else:
         raise ValueError(f"[Error] This market '{market_shortname}' is not supported.")
     
@@ -97,28 +327,6 @@ def __get_brvm_data__(market_shortname="BRVM",
         'yearly': '91'
     }
     
-    _range_date = []
-    _range_date_full = []
-    _start_date = datetime.strptime(start_date,"%Y-%m-%d").date()
-    _end_date = datetime.strptime(end_date,"%Y-%m-%d").date()
-    
-    if not _end_date >= _start_date:
-        raise ValueError(f"[Error] Invalid date.")
-    else:
-        # conversion date range split période by 85 days
-        n = 85
-        
-        val = _start_date
-        while val <= _end_date:
-            _range_date.append(val.strftime("%Y-%m-%d"))
-            if len(_range_date) == 2:
-                _range_date_full.append(_range_date)
-                _range_date = [val.strftime("%Y-%m-%d")]
-
-            val += timedelta(days=n)
-            if not (end_date in _range_date) and val > _end_date:
-                val = _end_date
-            
     if period in period_map:
         frequency = period_map[period.lower()]
     else:
@@ -127,72 +335,559 @@ def __get_brvm_data__(market_shortname="BRVM",
     if type(symbols) == str:
         if symbols.upper() == "ALL":
             symbols = real_ticker_list
+        else:
+            symbols = [symbols]
     
-    first_full_data = True
+    # validate the range before touching the local store
+    __split_windows__(start_date, end_date)
+    
+    full_symbols = {}
     for symbol in symbols:
-        data_symbol = {}
-        first_data = True
+        matches = [symb for symb in real_ticker_list if symb.startswith(symbol)]
+        if matches:
+            full_symbols[symbol] = matches[0]
+        else:
+            print(f"This ticker {symbol} is not available.")
+    
+    return frequency, full_symbols
+
+
+def __settled_until__(now=None):
+    """
+    Return the last date whose bars are final: today once the session is over, else yesterday.
+
+    Later dates have no end-of-day bar yet, so they are neither requested nor recorded as covered.
+
+    Args:
+        now (datetime, optional): Current time (UTC). Default is now.
+
+    Returns:
+        str: Date as 'YYYY-MM-DD'.
+    """
+    now = now or datetime.now(timezone.utc)
+    if (now.hour, now.minute) < SESSION_SETTLED_UTC:
+        now -= timedelta(days=1)
+    return now.strftime("%Y-%m-%d")
+
+
+def __closed_until__(period, settled):
+    """
+    Return the last date whose bar of `period` is final.
+
+    A weekly, monthly or yearly bar keeps changing until its period is over: only the
+    periods ended on or before `settled` are final, the open one is requested again by
+    every call until it closes.
+
+    Args:
+        period (str): Data frequency.
+        settled (str): Last settled session (see `__settled_until__`), 'YYYY-MM-DD'.
+
+    Returns:
+        str: `settled` for daily bars, else the last day of the last complete period.
+
+    Examples:
+        >>> __closed_until__("weekly", "2024-01-03"), __closed_until__("weekly", "2024-01-05")
+        ('2023-12-29', '2024-01-05')
+        >>> __closed_until__("monthly", "2024-01-31"), __closed_until__("yearly", "2024-06-30")
+        ('2024-01-31', '2023-12-31')
+    """
+    freq = RESAMPLE_PERIODS.get(period)
+    if freq is None:
+        return settled
+    current = pd.Period(settled, freq=freq)
+    if current.end_time.strftime("%Y-%m-%d") == settled:
+        return settled
+    return (current - 1).end_time.strftime("%Y-%m-%d")
+
+
+def __plan_jobs__(market_shortname, full_symbols, period, start_date, end_date, refresh=False):
+    """
+    Plan every missing (symbol, window) job before downloading anything.
+
+    Windows come from `__plan_windows__`: they do not overlap, skip the ranges already
+    stored and the dates after the last closed session, and go from the most recent one for
+    each symbol. The dates before a ticker's first stored quote are requested like any other.
+
+    Returns:
+        tuple: (missing_ranges, jobs) where missing_ranges maps each symbol to the ranges
+            absent from the local store and jobs lists (symbol, full_symbol, window, missing_range).
+    """
+    missing_ranges = {}
+    jobs = []
+    settled = __settled_until__()
+    with __span__("plan", symbols=len(full_symbols)) as span:
+        for symbol, full_symbol in full_symbols.items():
+            covered = [] if refresh else db_manager.__covered_ranges__(market_shortname, full_symbol, period, start_date, end_date)
+            # no listing date is known for these tickers: a stretch without quotes (suspension,
+            # illiquidity) is requested like any other gap, only the open session is skipped
+            plan = __plan_windows__(start_date, end_date, covered=covered, listing=(None, settled))
+            missing_ranges[symbol] = [gap for gap, windows in plan]
+            symbol_jobs = [(symbol, full_symbol, window, gap) for gap, windows in plan for window in windows]
+            # a symbol served without any request is a hit
+            __count__("store.misses" if symbol_jobs else "store.hits")
+            jobs.extend(symbol_jobs)
+        span.set(windows=len(jobs))
+    __count__("windows.planned", len(jobs))
+    return missing_ranges, jobs
+
+
+def __iter_symbol_frames__(market_shortname, full_symbols, period, frequency, start_date, end_date, max_workers=1, refresh=False, cache=None, progress=None, raw=False, failed=None):
+    """
+    Download the missing windows of each symbol and yield its frame as soon as it is complete.
+
+    Symbols already fully stored are yielded first, without any request. Each downloaded
+    symbol is written to the local store and its chunks are released before it is yielded,
+    so memory holds at most the symbols still being downloaded.
+
+    When a `failed` set is given, every symbol is added to it up front and removed once all
+    its windows are stored: what is left are the symbols with windows that failed every try
+    or that were never reached because the run stopped on an error.
+
+    Yields:
+        tuple[str, pd.DataFrame]: (symbol, OHLCV frame with a `Ticker` column), or (symbol, rows)
+            with `raw=True` (see `__store_symbol__`); symbols without data in the period are skipped.
+    """
+    missing_ranges, jobs = __plan_jobs__(market_shortname, full_symbols, period, start_date, end_date, refresh)
+    
+    pending = {symbol: 0 for symbol in full_symbols}
+    for job in jobs:
+        pending[job[0]] += 1
+    downloaded_rows = {symbol: [] for symbol in full_symbols}
+    failed_ranges = {symbol: set() for symbol in full_symbols}
+    if failed is not None:
+        failed.update(full_symbols)
+    
+    for symbol in full_symbols:
+        if pending[symbol] == 0:
+            if failed is not None:
+                failed.discard(symbol)
+            # nothing to download (every gap is after the last closed session): only the stored rows
+            frame = __store_symbol__(market_shortname, symbol, full_symbols[symbol], period, start_date, end_date, [], missing_ranges[symbol], set(), cache=cache, raw=raw)
+            if frame is not None:
+                yield symbol, frame
+    
+    for job, rows in __iter_jobs__(HISTOS_URL, jobs, frequency, max_workers=max_workers, progress=progress, refresh=refresh):
+        symbol = job[0]
+        # a range is covered only if none of its windows failed
+        if rows is None:
+            failed_ranges[symbol].add(job[3])
+        else:
+            downloaded_rows[symbol].extend(rows)
+        
+        pending[symbol] -= 1
+        if pending[symbol] == 0:
+            frame = __store_symbol__(market_shortname, symbol, full_symbols[symbol], period, start_date, end_date,
+                                     downloaded_rows.pop(symbol), missing_ranges[symbol], failed_ranges[symbol], cache=cache, raw=raw)
+            if failed is not None and not failed_ranges[symbol]:
+                failed.discard(symbol)
+            if frame is not None:
+                yield symbol, frame
+
+
+def __store_symbol__(market_shortname, symbol, full_symbol, period, start_date, end_date, rows, missing_ranges, failed_ranges, cache=None, raw=False):
+    """
+    Save the rows downloaded for a symbol and read its requested range back from the local store
+    (through the columnar cache when one is given).
+
+    With `raw=True` the stored rows are returned as they are read, without building any
+    frame (for the non-pandas outputs, see `__output_backends__`).
+
+    Returns:
+        pd.DataFrame | list[tuple] | None: OHLCV frame with a `Ticker` column (or the
+            (date, open, high, low, close, volume) rows), or None if there is no data.
+    """
+    settled = __settled_until__()
+    closed = __closed_until__(period, settled)
+    downloaded_ranges, covered_ranges = [], []
+    for missing_range in missing_ranges:
+        if missing_range not in failed_ranges:
+            if missing_range[0] <= min(missing_range[1], settled):
+                downloaded_ranges.append((missing_range[0], min(missing_range[1], settled)))
+            # the bars of an open session (or week, month, year) may still change: keep them out of the covered ranges
+            if missing_range[0] <= min(missing_range[1], closed):
+                covered_ranges.append((missing_range[0], min(missing_range[1], closed)))
+    if rows or downloaded_ranges:
+        db_manager.__save_price_history__(market_shortname, full_symbol, period, rows, covered_ranges, replaced_ranges=downloaded_ranges)
+    if failed_ranges:
+        print(f"[WARN] Some dates of {symbol} could not be downloaded; they will be requested again next time.")
+    
+    if raw:
+        data_symbol = db_manager.__get_price_history__(market_shortname, full_symbol, period, start_date, end_date)
+        if data_symbol:
+            print(f"Data extracted for {symbol.split('.')[0]} between {data_symbol[0][0]} - {data_symbol[-1][0]}.")
+            return data_symbol
+    else:
+        if cache is not None:
+            data_symbol = __read_cached__(cache, market_shortname, full_symbol, period, start_date, end_date)
+        else:
+            data_symbol = pd.DataFrame(
+                db_manager.__get_price_history__(market_shortname, full_symbol, period, start_date, end_date),
+                columns=OHLCV_COLUMNS
+            )
+        
+        if data_symbol.shape[0] > 0:
+            print(f"Data extracted for {symbol.split('.')[0]} between {data_symbol.iloc[0,0]} - {data_symbol.iloc[-1,0]}.")
+            return data_symbol.assign(Ticker=symbol)
+    
+    print(f"[Info] No data for {symbol} in the given period.")
+    return None
+
+
+def __read_cached__(cache, market_shortname, full_symbol, period, start_date, end_date):
+    """
+    Read a symbol's range from the columnar cache, rebuilding its partition from the local
+    store when rows were written to the store since the partition was (see `__history_version__`).
+
+    Returns:
+        pd.DataFrame: OHLCV rows sorted by date.
+    """
+    version = db_manager.__history_version__(market_shortname, full_symbol, period)
+    with __span__("cache.read", symbol=full_symbol):
+        data_symbol = cache.__read__(market_shortname, period, full_symbol, start_date, end_date, version=version)
+    if data_symbol is not None:
+        __count__("cache.hits")
+        return data_symbol
+    
+    __count__("cache.misses")
+    full_history = pd.DataFrame(
+        db_manager.__get_price_history__(market_shortname, full_symbol, period, "0000-01-01", "9999-12-31"),
+        columns=OHLCV_COLUMNS
+    )
+    with __span__("cache.write", symbol=full_symbol, rows=full_history.shape[0]):
+        cache.__write__(market_shortname, period, full_symbol, full_history, version=version)
+    in_range = (full_history["Date"] >= start_date) & (full_history["Date"] <= end_date)
+    return full_history[in_range].reset_index(drop=True)
+
+
+def __iter_brvm_data__(market_shortname="BRVM",
+                    symbols ="all",
+                    period: str = 'daily',
+                    start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                    end_date=datetime.today().strftime("%Y-%m-%d"),
+                    max_workers: int = 1,
+                    refresh: bool = False,
+                    cache = None,
+                    float32: bool = False,
+                    resample: bool = False,
+                    progress = None,
+                    failed: set = None):
+    """
+    Stream historical data for BRVM tickers, one symbol at a time.
+
+    Same arguments as `__get_brvm_data__`. Each symbol is yielded as soon as all its
+    windows are downloaded and stored, so a failure late in a run keeps what was done.
+    `failed` (a set) receives the symbols whose data is incomplete: some of their windows
+    could not be downloaded, or the stream stopped on an error before them.
+
+    Yields:
+        tuple[str, pd.DataFrame]: (symbol, normalized OHLCV frame indexed by `Date`, with a `Ticker` column).
+
+    Raises:
+        ValueError: If the market or period is not supported, or if the date range is invalid.
+    """
+    fetch_period = __fetch_period__(period, resample)
+    frequency, full_symbols = __resolve_request__(market_shortname, symbols, fetch_period, start_date, end_date)
+    for symbol, frame in __iter_symbol_frames__(market_shortname, full_symbols, fetch_period, frequency, start_date, end_date,
+                                                max_workers=max_workers, refresh=refresh, cache=cache, progress=progress, failed=failed):
+        if fetch_period != period:
+            frame = __resample_frame__(frame, period)
+        yield symbol, __normalize_frame__(frame, [symbol], float32=float32)
+
+
+def __get_brvm_data__(market_shortname="BRVM",
+                    symbols ="all",
+                    period: str = 'daily',
+                    start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                    end_date=datetime.today().strftime("%Y-%m-%d"),
+                    max_workers: int = 1,
+                    refresh: bool = False,
+                    cache = None,
+                    float32: bool = False,
+                    resample: bool = False,
+                    progress = None,
+                    output: str = None):
+    """
+    Extract historical data for BRVM tickers using the SikaFinance API.
+
+    Downloaded rows are kept in the local `price_history` table. For each symbol, only
+    the parts of the requested range that were never downloaded are requested from the
+    API; the output is then read back from the local store.
+
+    All (symbol, window) requests are planned up front, then downloaded either one
+    after the other (`max_workers=1`) or on a bounded pool of workers, under the rate
+    limit and retry policy set with `configure_http`. Symbols are reassembled in request
+    order, so both paths return the same output.
+
+    Args:
+        market_shortname (str, optional): Market shortname, default is "BRVM".
+        symbols (list[str], optional): List of ticker symbols to extract data for.
+        period (str, optional): Frequency of data ('daily', 'weekly', 'monthly', 'yearly').
+        start_date (str, optional): Start date of the extraction period ('YYYY-MM-DD').
+        end_date (str, optional): End date of the extraction period ('YYYY-MM-DD').
+        max_workers (int, optional): Number of concurrent downloads. Default is 1 (sequential).
+        refresh (bool, optional): Download the whole range again, ignoring the local store and the
+            cached responses (which are replaced).
+        cache (ColumnarCache, optional): Columnar cache used to read (and keep) the history.
+        float32 (bool, optional): Store prices and volumes as float32 instead of float64.
+        resample (bool, optional): Build weekly, monthly and yearly bars from the daily history
+            (downloaded once and shared by every period) instead of requesting each period.
+        progress (callable, optional): Called with a dict (done, failed, retried, total) after each window.
+        output (str, optional): 'numpy', 'arrow' or 'polars' to get the rows in that format
+            (see `__output_backends__`) instead of a `MarketDataOutput`.
+
+    Returns:
+        MarketDataOutput: Object containing extracted data as two DataFrames indexed by date
+            (or the rows in the `output` format):
+            - by_row: Data organized with one row per observation.
+            - by_col: Data organized with one column per ticker.
+
+    Raises:
+        ValueError: If the market or period is not supported, or if the date range is invalid.
+    """
+    all_dataframes = None
+    
+    __check_output__(output)
+    fetch_period = __fetch_period__(period, resample)
+    frequency, full_symbols = __resolve_request__(market_shortname, symbols, fetch_period, start_date, end_date)
+    # the other outputs are built from the stored rows, unless bars are resampled (with pandas)
+    raw = output is not None and fetch_period == period
+    data_symbol = dict(__iter_symbol_frames__(market_shortname, full_symbols, fetch_period, frequency, start_date, end_date,
+                                              max_workers=max_workers, refresh=refresh, cache=cache, progress=progress, raw=raw))
+    
+    frames = [data_symbol[symbol] for symbol in full_symbols if symbol in data_symbol]
+    if output is not None:
+        return __build_output__([symbol for symbol in full_symbols if symbol in data_symbol], frames, period, fetch_period, output, float32)
+    if fetch_period != period:
+        frames = [__resample_frame__(frame, period) for frame in frames]
+    if frames:
+        all_dataframe_row, all_dataframe_col = __assemble_frames__(frames, float32=float32)
+        all_dataframes = MarketDataOutput(market=market_shortname,by_row=all_dataframe_row,by_col=all_dataframe_col)
+
+    return all_dataframes
+
+
+def __build_output__(symbols, frames, period, fetch_period, output, float32=False):
+    """
+    Build a non-pandas output from the stored rows of each symbol.
+
+    Args:
+        symbols (list[str]): Symbols with data, in request order.
+        frames (list): Their rows (or daily frames, when bars are resampled).
+
+    Returns:
+        np.ndarray | pyarrow.Table | polars.DataFrame | None: The rows, or None if there is no data.
+    """
+    if not frames:
+        return None
+    if fetch_period != period:
+        frames = [list(__resample_frame__(frame, period)[OHLCV_COLUMNS].itertuples(index=False, name=None)) for frame in frames]
+    with __span__("assemble", symbols=len(frames), output=output):
+        return __price_output__(list(zip(symbols, frames)), output, float32=float32)
+
+
+def __fetch_period__(period, resample=False):
+    """
+    Return the period to download: 'daily' when coarser bars are resampled locally.
+
+    Raises:
+        ValueError: If the period cannot be resampled.
+    """
+    if not resample:
+        return period
+    if period not in RESAMPLE_PERIODS:
+        raise ValueError(f"[Error] the defined period '{period}' is not supported.")
+    return "daily"
+
+
+def __resample_frame__(frame, period):
+    """
+    Aggregate the daily OHLCV rows of one symbol into weekly, monthly or yearly bars.
+
+    Each bar takes the first open, the highest high, the lowest low, the last close
+    and the summed volume of its days, and is dated by the last day of its period
+    (Friday, end of month, end of year) whatever the ticker's last trade in it, so the
+    bars of several tickers line up in `by_col`. Bars at the edges of the requested
+    range only cover the days inside it.
+
+    Args:
+        frame (pd.DataFrame): Daily rows with a 'YYYY-MM-DD' `Date` column and a `Ticker` column.
+        period (str): 'weekly', 'monthly' or 'yearly'.
+
+    Returns:
+        pd.DataFrame: The bars, with the same columns as `frame`.
+    """
+    with __span__("resample", period=period, rows=frame.shape[0]):
+        dates = pd.to_datetime(frame["Date"], format="%Y-%m-%d")
+        periods = pd.PeriodIndex(dates, freq=RESAMPLE_PERIODS[period])
+        bars = frame.groupby(periods, sort=True).agg(
+            Open=("Open", "first"),
+            High=("High", "max"),
+            Low=("Low", "min"),
+            Close=("Close", "last"),
+            Volume=("Volume", "sum"),
+        )
+        bars.insert(0, "Date", pd.PeriodIndex(bars.index).to_timestamp(how="end").normalize().strftime("%Y-%m-%d"))
+    return bars.reset_index(drop=True).assign(Ticker=frame["Ticker"].iloc[0])
+
+
+def __assemble_frames__(frames, float32=False):
+    """
+    Build the `by_row` and `by_col` views from the per-symbol frames in one pass.
+
+    The frames are concatenated and normalized once (see `__normalize_frame__`), and
+    the wide view is obtained with a single unstack on the sorted date index (one
+    `SYMBOL.Field` column per symbol and field, symbols kept in request order, NaN
+    where a symbol has no quote for a date).
+
+    Args:
+        frames (list[pd.DataFrame]): One OHLCV frame per symbol, with a `Ticker` column.
+        float32 (bool, optional): Store prices and volumes as float32 instead of float64.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (by_row, by_col), both indexed by `Date`.
+    """
+    with __span__("assemble", symbols=len(frames)) as span:
+        symbols = [frame["Ticker"].iloc[0] for frame in frames]
+        all_dataframe_row = __normalize_frame__(pd.concat(frames, axis=0, ignore_index=True), symbols, float32=float32)
+        fields = [col for col in all_dataframe_row.columns if col != "Ticker"]
+        
+        all_dataframe_col = (
+            all_dataframe_row.set_index("Ticker", append=True)[fields]
+            .unstack("Ticker")
+            .sort_index()
+        )
+        all_dataframe_col = all_dataframe_col.reindex(
+            columns=pd.MultiIndex.from_tuples([(field, symbol) for symbol in symbols for field in fields])
+        )
+        all_dataframe_col.columns = [symbol + "." + field for field, symbol in all_dataframe_col.columns]
+        span.set(rows=all_dataframe_row.shape[0])
+    
+    return all_dataframe_row, all_dataframe_col
+
+
+def __normalize_frame__(frame, symbols=None, float32=False):
+    """
+    Give an OHLCV frame compact, typed columns.
+
+    - `Date` is parsed in one vectorized pass and becomes a `datetime64` index.
+    - Prices and volumes become float64 (float32 on request).
+    - `Ticker` becomes a categorical (categories in request order).
+
+    Args:
+        frame (pd.DataFrame): OHLCV rows with 'YYYY-MM-DD' dates in a `Date` column.
+        symbols (list[str], optional): Categories of `Ticker`. Default is the order of appearance.
+        float32 (bool, optional): Use float32 for prices and volumes.
+
+    Returns:
+        pd.DataFrame: The normalized frame.
+    """
+    dtype = "float32" if float32 else "float64"
+    numeric = [col for col in frame.columns if col not in ("Date", "Ticker")]
+    
+    frame = frame.astype({col: dtype for col in numeric})
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame["Date"], format="%Y-%m-%d"), name="Date")
+    frame = frame.drop(columns="Date")
+    if "Ticker" in frame.columns:
+        categories = symbols if symbols is not None else list(dict.fromkeys(frame["Ticker"]))
+        frame["Ticker"] = pd.Categorical(frame["Ticker"], categories=categories)
+    return frame
+
+
+async def __aget_brvm_data__(market_shortname="BRVM",
+                    symbols ="all",
+                    period: str = 'daily',
+                    start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                    end_date=datetime.today().strftime("%Y-%m-%d"),
+                    concurrency: int = 8,
+                    refresh: bool = False,
+                    cache = None,
+                    float32: bool = False,
+                    resample: bool = False,
+                    progress = None,
+                    output: str = None):
+    """
+    Awaitable counterpart of `__get_brvm_data__`.
+
+    The ticker universe (if stale) and every (symbol, window) job are downloaded with a
+    non-blocking client sharing one connection pool; at most `concurrency` requests are
+    in flight at once. The local database is only used from worker threads (planning
+    before the downloads, storing and assembling after), so a locked database never
+    blocks the event loop. The output is identical to `__get_brvm_data__`.
+
+    Args:
+        Same as `__get_brvm_data__`, with `concurrency` instead of `max_workers`.
+
+    Returns:
+        MarketDataOutput: Same as `__get_brvm_data__`.
+    """
+    import asyncio
+    from marketflow.__marketconfig__.tickerextraction import brvm_ticker
+    
+    __check_output__(output)
+    async with __http_client__.__async_client__() as client:
+        stale = await asyncio.to_thread(
+            lambda: market_shortname in db_manager.__market_list__() and not MarketTickers().__is_fresh__(market_shortname)
+        )
+        if stale:
+            await brvm_ticker.__aget_tickers__(market_shortname, client=client)
         
-        full_symbol = [symb for symb in real_ticker_list if symb.startswith(symbol)][0]
+        fetch_period = __fetch_period__(period, resample)
+        frequency, full_symbols = await asyncio.to_thread(__resolve_request__, market_shortname, symbols, fetch_period, start_date, end_date, refresh_tickers=False)
+        missing_ranges, jobs = await asyncio.to_thread(__plan_jobs__, market_shortname, full_symbols, fetch_period, start_date, end_date, refresh)
         
-        if full_symbol in real_ticker_list:
-
-            for row_period in _range_date_full:
-                response = requests.post(
-                    url = url,
-                    json = {
-                        "ticker": full_symbol,
-                        "datedeb": row_period[0],
-                        "datefin": row_period[1],
-                        "xperiod": frequency
-                    }
-                )
-                
-                #print(post_table.status_code)
-                if response.status_code == 200:
-                    data_json = response.json()  
-                    
-                    if 'error' in data_json and data_json['error'] == 'nodata':
-                        data_symbol[symbol] = pd.DataFrame()  # DataFrame vide
-                        continue
-                    else:
-                        # ici selon la structure réelle de l'API, souvent data_json['lst'] ou data_json['Data']
-                        df = pd.DataFrame(data_json.get('lst', []))
-                        
-                        if first_data == True:
-                            data_symbol[symbol] = df
-                            first_data = False
-                        else:
-                            data_symbol[symbol] = pd.concat([data_symbol[symbol],df],axis=0)
-            
-            if data_symbol[symbol].shape[0] > 0:  
-                                    
-                print(f"Data extracted for {symbol.split('.')[0]} between {data_symbol[symbol].iloc[0,0]} - {data_symbol[symbol].iloc[-1,0]}.")  
-
-                data_symbol_row = pd.DataFrame(data_symbol[symbol])
-                data_symbol_col = pd.DataFrame(data_symbol[symbol])
-                
-                data_symbol_row["Ticker"] = symbol
-                data_symbol_col.columns = ["Date"] + [symbol + "." + val for val in data_symbol[symbol].columns.drop("Date")]
-                #print(data_symbol_row)
-                #
-                
-                if first_full_data == True: 
-                    all_dataframe_row = data_symbol_row
-                    all_dataframe_col = data_symbol_col
-                    first_full_data = False
-                else:
-                    all_dataframe_row = pd.concat([all_dataframe_row,data_symbol_row],axis=0)
-                    all_dataframe_col = pd.merge(all_dataframe_col,data_symbol_col,how="outer",on="Date")
-                    
-                all_dataframe_row = all_dataframe_row.drop_duplicates()                
-                all_dataframe_col = all_dataframe_col.drop_duplicates()
-            else:
-                print(f"[Info] No data for {symbol} in the given period.")
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        stats = {"done": 0, "failed": 0, "retried": 0, "total": len(jobs)}
+        
+        async def run(job):
+            rows = await __afetch_window__(client, semaphore, job[1], job[2], frequency, stats, refresh)
+            stats["done"] += 1
+            stats["failed"] += rows is None
+            if progress is not None:
+                try:
+                    progress(dict(stats))
+                except Exception:
+                    pass
+            return rows
+        
+        chunks = await asyncio.gather(*[run(job) for job in jobs])
+    
+    return await asyncio.to_thread(__store_chunks__, market_shortname, full_symbols, period, fetch_period, start_date, end_date,
+                                   missing_ranges, jobs, chunks, cache, float32, output)
+
+
+def __store_chunks__(market_shortname, full_symbols, period, fetch_period, start_date, end_date, missing_ranges, jobs, chunks, cache=None, float32=False, output=None):
+    """
+    Store the chunks downloaded by `__aget_brvm_data__` and build its output (blocking: run
+    in a worker thread).
+
+    Returns:
+        MarketDataOutput | np.ndarray | pyarrow.Table | polars.DataFrame | None: Same as `__get_brvm_data__`.
+    """
+    all_dataframes = None
+    
+    downloaded_rows = {symbol: [] for symbol in full_symbols}
+    failed_ranges = {symbol: set() for symbol in full_symbols}
+    for job, rows in zip(jobs, chunks):
+        if rows is None:
+            failed_ranges[job[0]].add(job[3])
         else:
-            print(f"This ticker {symbol} is not available.")
-            
-        if all_dataframe_row.shape[0] > 0:
-            all_dataframes = MarketDataOutput(market=market_shortname,by_row=all_dataframe_row,by_col=all_dataframe_col)
+            downloaded_rows[job[0]].extend(rows)
+    
+    raw = output is not None and fetch_period == period
+    stored_symbols, frames = [], []
+    for symbol, full_symbol in full_symbols.items():
+        frame = __store_symbol__(market_shortname, symbol, full_symbol, fetch_period, start_date, end_date,
+                                 downloaded_rows.pop(symbol), missing_ranges[symbol], failed_ranges[symbol], cache=cache, raw=raw)
+        if frame is not None:
+            stored_symbols.append(symbol)
+            frames.append(frame)
+    
+    if output is not None:
+        return __build_output__(stored_symbols, frames, period, fetch_period, output, float32)
+    if fetch_period != period:
+        frames = [__resample_frame__(frame, period) for frame in frames]
+    if frames:
+        all_dataframe_row, all_dataframe_col = __assemble_frames__(frames, float32=float32)
+        all_dataframes = MarketDataOutput(market=market_shortname,by_row=all_dataframe_row,by_col=all_dataframe_col)
 
     return all_dataframes
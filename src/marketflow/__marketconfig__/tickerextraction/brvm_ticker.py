@@ -1,11 +1,26 @@
-from bs4 import BeautifulSoup
-import requests
+from bs4 import BeautifulSoup, SoupStrainer
+import os
+import re
+from marketflow.__marketconfig__ import __http_client__
 from marketflow.__db_manager__ import DBManager
+from marketflow.market_metrics import __span__, __count__
 
 
 db_manager = DBManager()
 
-def __get_tickers__(market_shortname="BRVM"):
+# MARKETFLOW_SIKAFINANCE_URL points the extractor to a mirror or a local stand-in server
+TICKERS_URL = os.environ.get("MARKETFLOW_SIKAFINANCE_URL", "https://www.sikafinance.com").rstrip("/") + "/"
+
+# lxml parses much faster when it is installed (pip install marketflow[fast])
+try:
+    import lxml
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+DPSHARES_START = re.compile(r"""<select[^>]*\bid\s*=\s*["']?dpShares\b""", re.IGNORECASE)
+
+def __get_tickers__(market_shortname="BRVM", use_web: bool = True):
     """
     Retrieve ticker information (indexes and shares) for a given market.
 
@@ -13,6 +28,8 @@ def __get_tickers__(market_shortname="BRVM"):
     
     1. **Fetch from the web**  
        - Scrapes ticker information from `https://www.sikafinance.com/` using BeautifulSoup.  
+       - Sends the `ETag` / `Last-Modified` validators of the last download: when the page
+         did not change, the server answers 304 and the stored list is reused without parsing.  
        - Extracts both ticker symbol and description from the HTML select element `#dpShares`.  
        - Splits tickers into two categories:  
          - INDEXES: Tickers starting with "BRVM".
@@ -27,6 +44,8 @@ def __get_tickers__(market_shortname="BRVM"):
 
     Args:
         market_shortname (str, optional): Shortname of the market. Default is `"BRVM"`.
+        use_web (bool, optional): If False, step 1 is skipped and the tickers are read from
+            the local database only (used when the stored list is still fresh).
 
     Returns:
         list[list]: A list containing two sublists:  
@@ -41,48 +60,168 @@ def __get_tickers__(market_shortname="BRVM"):
         - Web scraping depends on the structure of `sikafinance.com`; changes on the website may break this method.  
         - Local database must already be populated with valid ticker data for the fallback to work.
     """
-    url = "https://www.sikafinance.com/"
-    all_tables = []
-
     # Étape 1 : tenter de récupérer via Internet
-    try:
-        response = requests.get(url=url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, features="html.parser")
-        options = soup.select("#dpShares option")
-
-        values = []
-        for opt in options:
-            val = opt.get("value").strip()
-            text = opt.get_text(strip=True)
-            if val:  # éviter l'option vide "Choisir une valeur"
-                val_split = val.split(".")
-                if len(val_split) == 2:
-                    values.append(["","",val_split[0],val, text, val_split[1].upper()])
-                else:
-                    values.append(["","",val_split[0],val, text, ""])
-
-        sorted_table = sorted(values, key=lambda x: x[2])
-
-        # Séparer INDEXES et SHARES
-        indexes = [row for row in sorted_table if row[2].startswith("BRVM")]
-        shares = [row for row in sorted_table if not (row[2].startswith("BRVM") or row[2].startswith("SIKA"))]
-
-        all_tables.append(indexes)
-        all_tables.append(shares)
-
-        # # Sauvegarde dans la DB
-        for row in indexes:
-            db_manager.__add_tickers__(market_shortname, "INDEX", row[2], row[3], row[4], row[5])
-        for row in shares:
-            db_manager.__add_tickers__(market_shortname, "SHARE", row[2], row[3], row[4], row[5])
+    if use_web:
+        try:
+            response = __http_client__.__get__(TICKERS_URL, timeout=10, headers=__conditional_headers__(market_shortname))
+            return __handle_response__(market_shortname, response)
 
-        return all_tables
-
-    except Exception as e:
-        print(f"[WARN] Web retrieval failure.")
+        except Exception as e:
+            print(f"[WARN] Web retrieval failure.")
 
     # Étape 2 : tenter de récupérer dans la DB locale
+    return __local_tickers__(market_shortname)
+
+
+async def __aget_tickers__(market_shortname="BRVM", use_web: bool = True, client = None):
+    """
+    Awaitable counterpart of `__get_tickers__`, downloading the page without blocking the event loop.
+
+    Args:
+        market_shortname (str, optional): Shortname of the market. Default is `"BRVM"`.
+        use_web (bool, optional): If False, the tickers are read from the local database only.
+        client (httpx.AsyncClient, optional): Client to reuse; a new one is opened otherwise.
+
+    Returns:
+        list[list]: Same as `__get_tickers__`.
+    """
+    import asyncio
+
+    # the local database is read and written in worker threads, out of the event loop
+    if use_web:
+        try:
+            headers = await asyncio.to_thread(__conditional_headers__, market_shortname)
+            if client is None:
+                async with __http_client__.__async_client__() as client:
+                    response = await __http_client__.__arequest__(client, "GET", TICKERS_URL, timeout=10, headers=headers)
+            else:
+                response = await __http_client__.__arequest__(client, "GET", TICKERS_URL, timeout=10, headers=headers)
+            return await asyncio.to_thread(__handle_response__, market_shortname, response)
+
+        except ImportError:
+            raise
+        except Exception as e:
+            print(f"[WARN] Web retrieval failure.")
+
+    return await asyncio.to_thread(__local_tickers__, market_shortname)
+
+
+def __conditional_headers__(market_shortname):
+    """
+    Build the `If-None-Match` / `If-Modified-Since` headers from the stored validators.
+
+    Validators are only sent when the market already has tickers in the local database,
+    since a 304 answer carries no content.
+
+    Returns:
+        dict: Request headers (empty when nothing is stored).
+    """
+    if not db_manager.__ticker_list__(market_shortname=market_shortname):
+        return {}
+    
+    etag, last_modified = db_manager.__get_validators__(TICKERS_URL)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def __handle_response__(market_shortname, response):
+    """
+    Turn the homepage response into [INDEXES, SHARES] rows.
+
+    A 304 (not modified) answer keeps the stored tickers and only renews their refresh
+    time; a new page is parsed, saved, and its validators are kept for the next request.
+
+    Raises:
+        HTTPError: If the response is an error.
+    """
+    if response.status_code == 304:
+        __count__("tickers.not_modified")
+        db_manager.__set_tickers_refreshed_at__(market_shortname)
+        return __local_tickers__(market_shortname)
+    
+    response.raise_for_status()
+    all_tables = __save_tickers__(market_shortname, response.text)
+    db_manager.__set_validators__(TICKERS_URL, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return all_tables
+
+
+def __dpshares_options__(html):
+    """
+    Parse only the `#dpShares` list of the homepage.
+
+    The `<select id="dpShares">` element is cut out of the page before parsing (the rest of
+    the page is never parsed), and the parser is restricted to it with a `SoupStrainer`
+    in case the cut fails.
+
+    Returns:
+        list[Tag]: The `<option>` elements of the list.
+    """
+    match = DPSHARES_START.search(html)
+    if match:
+        end = html.find("</select>", match.end())
+        if end != -1:
+            html = html[match.start():end + len("</select>")]
+    
+    soup = BeautifulSoup(html, features=HTML_PARSER, parse_only=SoupStrainer(id="dpShares"))
+    return soup.select("#dpShares option")
+
+
+def __save_tickers__(market_shortname, html):
+    """
+    Parse the `#dpShares` list of the sikafinance.com homepage and save the tickers locally.
+
+    Args:
+        market_shortname (str): Shortname of the market.
+        html (str): Content of the homepage.
+
+    Returns:
+        list[list]: [INDEXES, SHARES] rows, as returned by `__get_tickers__`.
+    """
+    all_tables = []
+    __count__("tickers.scrapes")
+    with __span__("parse.tickers", bytes=len(html)):
+        options = __dpshares_options__(html)
+
+    values = []
+    for opt in options:
+        val = opt.get("value").strip()
+        text = opt.get_text(strip=True)
+        if val:  # éviter l'option vide "Choisir une valeur"
+            val_split = val.split(".")
+            if len(val_split) == 2:
+                values.append(["","",val_split[0],val, text, val_split[1].upper()])
+            else:
+                values.append(["","",val_split[0],val, text, ""])
+
+    sorted_table = sorted(values, key=lambda x: x[2])
+
+    # Séparer INDEXES et SHARES
+    indexes = [row for row in sorted_table if row[2].startswith("BRVM")]
+    shares = [row for row in sorted_table if not (row[2].startswith("BRVM") or row[2].startswith("SIKA"))]
+
+    all_tables.append(indexes)
+    all_tables.append(shares)
+
+    # Sauvegarde dans la DB (une seule transaction)
+    db_manager.__upsert_tickers__(
+        market_shortname,
+        [("INDEX", row[2], row[3], row[4], row[5]) for row in indexes] +
+        [("SHARE", row[2], row[3], row[4], row[5]) for row in shares]
+    )
+    db_manager.__set_tickers_refreshed_at__(market_shortname)
+
+    return all_tables
+
+
+def __local_tickers__(market_shortname):
+    """
+    Load the tickers of a market from the local database, split into [INDEXES, SHARES].
+    """
+    all_tables = []
     try:
         sorted_table = db_manager.__get_tickers__(market_shortname=market_shortname)
 
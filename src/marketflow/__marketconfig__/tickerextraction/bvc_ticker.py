@@ -1,56 +1,85 @@
-from marketflow.market_information import MarketInformation
-from marketflow.market_registry import MarketRegistry
 from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-import requests, certifi
-from tabulate import tabulate
+import os
+from marketflow.__marketconfig__ import __http_client__
 
 from marketflow.__db_manager__ import DBManager
 
 db_manager = DBManager()
 
+# MARKETFLOW_BVC_URL points the extractor to a mirror or a local stand-in server
+INSTRUMENTS_URL = os.environ.get("MARKETFLOW_BVC_URL", "https://www.casablanca-bourse.com").rstrip("/") + "/en/instruments"
 
 
-def __get_tickers__(market_shortname="BVC"):
-    url_share = "https://www.casablanca-bourse.com/en/instruments"
-    tickers_headers = ["ID","ID Market","Symbols","Description","Country Code"]
+def __get_tickers__(market_shortname="BVC", use_web: bool = True):
+    """
+    Retrieve the instruments listed on the Casablanca Stock Exchange.
 
-    try:
-        #driver = webdriver.Chrome()
-        response = requests.get(url=url_share, timeout=10, verify=False)
-        response.raise_for_status()
-        print(f"[INFO] HTTP {response.status_code}")
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+    1. **Fetch from the web**: reads the instrument list of `casablanca-bourse.com`
+       and saves it into the local database (all instruments as SHARES, country "MA").
+    2. **Fallback to local database**: if the web request fails (or `use_web` is False).
+
+    Args:
+        market_shortname (str, optional): Shortname of the market. Default is `"BVC"`.
+        use_web (bool, optional): If False, the tickers are read from the local database only.
+
+    Returns:
+        list[list]: [INDEXES, SHARES] rows, as returned by `brvm_ticker.__get_tickers__`.
+    """
+    # Étape 1 : tenter de récupérer via Internet
+    if use_web:
+        try:
+            response = __http_client__.__get__(INSTRUMENTS_URL, timeout=10, verify=False)
+            response.raise_for_status()
+            return __save_tickers__(market_shortname, response.text)
+
+        except Exception as e:
+            print(f"[WARN] Web retrieval failure.")
+
+    # Étape 2 : tenter de récupérer dans la DB locale
+    return __local_tickers__(market_shortname)
+
+
+def __save_tickers__(market_shortname, html):
+    """
+    Parse the instrument list and save the tickers locally.
 
-        # On cible uniquement la liste des tickers
-        options = soup.find_all("option")
-        
-        values = []
-        for opt in options:
-            label = opt.text.strip()
-            val = opt.get("value")
+    Returns:
+        list[list]: [INDEXES, SHARES] rows.
+    """
+    soup = BeautifulSoup(html, "html.parser")
 
-            # ignorer les en-têtes ou entrées vides
-            if not val or val.lower() in ["issuers"]:
-                continue
+    # On cible uniquement la liste des tickers
+    options = soup.find_all("option")
 
-            # Ajouter comme ticker + description identiques
-            values.append(["", market_shortname, val, label, "MA"])
+    values = []
+    for opt in options:
+        label = opt.text.strip()
+        val = opt.get("value")
 
-        # Trier par symbole
-        sorted_table = sorted(values, key=lambda x: x[2])
+        # ignorer les en-têtes ou entrées vides
+        if not val or val.lower() in ["issuers"]:
+            continue
 
-        # Debug : aperçu
-        for row in sorted_table[:10]:
-            print(row)
+        # Ajouter comme ticker + description
+        values.append(["", "", val, val, label, "MA"])
 
-        return sorted_table
+    # Trier par symbole
+    shares = sorted(values, key=lambda x: x[2])
+
+    db_manager.__upsert_tickers__(market_shortname, [("SHARE", row[2], row[3], row[4], row[5]) for row in shares])
+    db_manager.__set_tickers_refreshed_at__(market_shortname)
+
+    return [[], shares]
+
+
+def __local_tickers__(market_shortname):
+    """
+    Load the tickers of the market from the local database, as [INDEXES, SHARES].
+    """
+    try:
+        rows = db_manager.__get_tickers__(market_shortname=market_shortname)
+        return [[], rows] if rows else []
 
     except Exception as e:
-        print(f"[ERROR] {e}")
+        print(f"[ERROR] Unable to retrieve tickers.")
         return []
-
-# Exemple d’appel
-tickers = __get_tickers__()
-print(tickers)
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Output backends other than pandas: NumPy structured arrays, Arrow tables and Polars frames.
+
+They are built straight from the rows read from the local store, one typed column at a
+time, without any pandas object in between. The price columns are NumPy arrays handed
+over as is: Arrow and Polars wrap them without copying.
+
+    - "numpy": structured array with the fields Date (datetime64[D]), Open, High, Low, Close, Volume, Ticker,
+    - "arrow": `pyarrow.Table` with the same columns (Ticker dictionary-encoded, Date as date32),
+    - "polars": `polars.DataFrame` with the same columns (Ticker as an Enum).
+
+Rows are in the `by_row` order of `MarketDataOutput`: symbols in request order, dates ascending.
+"""
+
+import numpy as np
+
+
+OUTPUT_FORMATS = ("numpy", "arrow", "polars")
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+TICKER_COLUMNS = ("Type", "Symbol", "FullSymbol", "Description", "Country")
+
+
+def __check_output__(output):
+    """
+    Validate an `output=` argument (None keeps the default container) and import its library.
+
+    Raises:
+        ValueError: If the output is not supported.
+        ImportError: If the library of the output is not installed.
+    """
+    if output is None:
+        return
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"[Error] the output '{output}' is not supported; use one of {list(OUTPUT_FORMATS)}.")
+    if output == "arrow":
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("The 'arrow' output needs pyarrow: pip install marketflow[columnar]")
+    if output == "polars":
+        try:
+            import polars
+        except ImportError:
+            raise ImportError("The 'polars' output needs polars: pip install marketflow[polars]")
+
+
+def __price_columns__(symbol_rows, float32=False):
+    """
+    Turn per-symbol OHLCV rows into typed columns.
+
+    Args:
+        symbol_rows (list[tuple]): (symbol, rows) pairs, rows as (date, open, high, low, close, volume).
+        float32 (bool, optional): Use float32 for prices and volumes.
+
+    Returns:
+        tuple: (symbols, codes, dates, prices) where codes holds the index of each row's symbol
+            in `symbols`, dates is a datetime64[D] array and prices maps each column to its array.
+    """
+    dtype = "float32" if float32 else "float64"
+    symbols = [symbol for symbol, _ in symbol_rows]
+    codes = np.repeat(np.arange(len(symbols), dtype="int32"), [len(rows) for _, rows in symbol_rows])
+    values = list(zip(*(row for _, rows in symbol_rows for row in rows))) or [()] * (len(PRICE_COLUMNS) + 1)
+
+    dates = np.array(values[0], dtype="datetime64[D]")
+    # missing values (None) become NaN
+    prices = {col: np.array(values[i + 1], dtype=dtype) for i, col in enumerate(PRICE_COLUMNS)}
+    return symbols, codes, dates, prices
+
+
+def __price_output__(symbol_rows, output, float32=False):
+    """
+    Build the requested representation of the OHLCV rows of several symbols.
+
+    Args:
+        symbol_rows (list[tuple]): (symbol, rows) pairs, in output order.
+        output (str): One of `OUTPUT_FORMATS`.
+        float32 (bool, optional): Use float32 for prices and volumes.
+
+    Returns:
+        np.ndarray | pyarrow.Table | polars.DataFrame: The rows.
+    """
+    symbols, codes, dates, prices = __price_columns__(symbol_rows, float32)
+
+    if output == "numpy":
+        width = max([len(symbol) for symbol in symbols] + [1])
+        array = np.empty(len(dates), dtype=[("Date", "datetime64[D]")] +
+                                           [(col, prices[col].dtype) for col in PRICE_COLUMNS] +
+                                           [("Ticker", f"U{width}")])
+        array["Date"] = dates
+        for col in PRICE_COLUMNS:
+            array[col] = prices[col]
+        array["Ticker"] = np.array(symbols, dtype=f"U{width}")[codes] if symbols else []
+        return array
+
+    if output == "arrow":
+        import pyarrow as pa
+
+        columns = {"Date": pa.array(dates, type=pa.date32())}
+        columns.update({col: pa.array(prices[col]) for col in PRICE_COLUMNS})
+        columns["Ticker"] = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(symbols, type=pa.string()))
+        return pa.table(columns)
+
+    if output == "polars":
+        import polars as pl
+
+        return pl.DataFrame(
+            [pl.Series("Date", dates)] +
+            [pl.Series(col, prices[col]) for col in PRICE_COLUMNS] +
+            [pl.Series("Ticker", symbols, dtype=pl.Enum(symbols)).gather(codes)]
+        )
+
+    raise ValueError(f"[Error] the output '{output}' is not supported; use one of {list(OUTPUT_FORMATS)}.")
+
+
+def __ticker_output__(ticker_database, output):
+    """
+    Build the requested representation of a ticker universe.
+
+    Args:
+        ticker_database (list[list]): [INDEXES rows, SHARES rows] as returned by the ticker
+            extractors, rows as (id, market_id, symbol, full_symbol, description, country).
+        output (str): One of `OUTPUT_FORMATS`.
+
+    Returns:
+        np.ndarray | pyarrow.Table | polars.DataFrame: One row per ticker with the columns `TICKER_COLUMNS`.
+    """
+    rows = [(kind,) + tuple(row[2:6]) for kind, group in zip(("INDEX", "SHARE"), ticker_database or []) for row in group]
+    values = list(zip(*rows)) or [()] * len(TICKER_COLUMNS)
+    columns = {col: [str(value) if value is not None else "" for value in values[i]] for i, col in enumerate(TICKER_COLUMNS)}
+
+    if output == "numpy":
+        array = np.empty(len(rows), dtype=[(col, f"U{max([len(value) for value in columns[col]] + [1])}") for col in TICKER_COLUMNS])
+        for col in TICKER_COLUMNS:
+            array[col] = columns[col]
+        return array
+
+    if output == "arrow":
+        import pyarrow as pa
+
+        return pa.table({col: pa.array(columns[col], type=pa.string()) for col in TICKER_COLUMNS})
+
+    if output == "polars":
+        import polars as pl
+
+        return pl.DataFrame({col: pl.Series(col, columns[col], dtype=pl.Utf8) for col in TICKER_COLUMNS})
+
+    raise ValueError(f"[Error] the output '{output}' is not supported; use one of {list(OUTPUT_FORMATS)}.")
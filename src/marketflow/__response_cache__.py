@@ -0,0 +1,140 @@
+"""
+Content-addressed disk cache of API responses.
+
+Each response is stored compressed under the SHA-256 of its request (URL and body):
+
+    <cache_dir>/<first 2 hex digits>/<sha256>.gz
+
+A window that ends before today always gets the same answer, so it is kept until
+evicted; a window reaching today may still change and expires after `ttl` seconds.
+When the cache grows over `max_bytes`, the least recently used entries are removed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+
+
+class ResponseCache():
+    """
+    A size-bounded, LRU-evicted cache of compressed response payloads.
+
+    Attributes:
+        cache_dir (str): Root directory of the cache.
+        max_bytes (int): Maximum total size of the cache files.
+        ttl (float): Lifetime in seconds of the entries that may still change.
+    """
+
+    # header of every file: expiry time (0 = never), as a big-endian double
+    HEADER = struct.Struct(">d")
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024, ttl: float = 900):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __key__(self, url: str, body: dict):
+        """
+        Return the content address of a request.
+        """
+        canonical = json.dumps({"url": url, "body": body}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def __path__(self, key: str):
+        return os.path.join(self.cache_dir, key[:2], key + ".gz")
+
+    def __read__(self, url: str, body: dict):
+        """
+        Return the cached payload of a request, or None if it is missing or expired.
+
+        A hit marks the entry as recently used.
+
+        Returns:
+            bytes | None: The uncompressed payload.
+        """
+        path = self.__path__(self.__key__(url, body))
+        try:
+            with open(path, "rb") as fp:
+                (expires_at,) = self.HEADER.unpack(fp.read(self.HEADER.size))
+                if expires_at and expires_at < time.time():
+                    return None
+                payload = gzip.decompress(fp.read())
+            os.utime(path)
+        except (OSError, EOFError, struct.error):
+            return None
+        return payload
+
+    def __write__(self, url: str, body: dict, payload: bytes, permanent: bool = True):
+        """
+        Store the payload of a request, then evict the least recently used entries if needed.
+
+        Args:
+            url (str): Request URL.
+            body (dict): Request body.
+            payload (bytes): Response payload.
+            permanent (bool, optional): False for a response that may still change (expires after `ttl`).
+        """
+        path = self.__path__(self.__key__(url, body))
+        data = self.HEADER.pack(0.0 if permanent else time.time() + self.ttl) + gzip.compress(payload, compresslevel=6)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp_path, path)
+
+            if self._size is None:
+                self._size = sum(size for _, _, size in self.__entries__())
+            else:
+                self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self.__evict__()
+
+    def __entries__(self):
+        """
+        List the cache files as (last use, path, size).
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for folder in os.scandir(self.cache_dir):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".gz"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def __evict__(self):
+        """
+        Remove the least recently used entries until the cache is back under 90% of `max_bytes` (lock held).
+        """
+        entries = sorted(self.__entries__())
+        self._size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self._size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+    def __clear__(self):
+        """
+        Delete every cached response.
+        """
+        import shutil
+
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._size = 0
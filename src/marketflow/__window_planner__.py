@@ -0,0 +1,145 @@
+"""
+Planning of the date windows requested from a history API.
+
+Given a requested range, the ranges already stored locally and, when known, the
+range in which a ticker is listed, the planner returns only the windows that still
+have to be downloaded:
+
+    - windows never overlap (no boundary date is fetched twice),
+    - each window spans at most `WINDOW_DAYS` days, bounds included,
+    - covered ranges and dates outside the listing range produce no window,
+    - the most recent windows come first, so the freshest data arrives first.
+
+Everything here is pure date arithmetic on 'YYYY-MM-DD' strings, so it can be
+checked without any network access:
+
+    python -m doctest src/marketflow/__window_planner__.py
+"""
+
+from datetime import datetime, timedelta
+
+
+# longest window accepted by SikaFinance GetHistos (the former 85-day steps, both bounds included)
+WINDOW_DAYS = 86
+
+
+def __to_date__(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def __to_str__(value):
+    return value.strftime("%Y-%m-%d")
+
+
+def __split_windows__(start_date: str, end_date: str, window_days: int = WINDOW_DAYS):
+    """
+    Split a range into consecutive, non-overlapping windows of at most `window_days` days.
+
+    Args:
+        start_date (str): First date of the range ('YYYY-MM-DD').
+        end_date (str): Last date of the range ('YYYY-MM-DD').
+        window_days (int, optional): Maximum number of days of a window, bounds included.
+
+    Returns:
+        list[tuple[str, str]]: (datedeb, datefin) windows in chronological order.
+
+    Raises:
+        ValueError: If the end date is before the start date.
+
+    Examples:
+        >>> __split_windows__("2024-01-01", "2024-01-10", window_days=4)
+        [('2024-01-01', '2024-01-04'), ('2024-01-05', '2024-01-08'), ('2024-01-09', '2024-01-10')]
+        >>> __split_windows__("2024-03-01", "2024-03-01")
+        [('2024-03-01', '2024-03-01')]
+        >>> len(__split_windows__("2020-01-01", "2024-12-31"))
+        22
+    """
+    start, end = __to_date__(start_date), __to_date__(end_date)
+    if end < start:
+        raise ValueError(f"[Error] Invalid date.")
+
+    windows = []
+    step = timedelta(days=window_days - 1)
+    while start <= end:
+        window_end = min(start + step, end)
+        windows.append((__to_str__(start), __to_str__(window_end)))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def __subtract_ranges__(start_date: str, end_date: str, covered: list):
+    """
+    Return the parts of [start_date, end_date] that are not in any of the `covered` ranges.
+
+    Args:
+        start_date (str): First date of the range ('YYYY-MM-DD').
+        end_date (str): Last date of the range ('YYYY-MM-DD').
+        covered (list[tuple]): (start_date, end_date) ranges, in any order, possibly overlapping.
+
+    Returns:
+        list[tuple[str, str]]: Uncovered ranges in chronological order.
+
+    Examples:
+        >>> __subtract_ranges__("2024-01-01", "2024-12-31", [("2024-03-01", "2024-05-31"), ("2024-05-15", "2024-06-30")])
+        [('2024-01-01', '2024-02-29'), ('2024-07-01', '2024-12-31')]
+        >>> __subtract_ranges__("2024-01-01", "2024-01-31", [("2023-12-01", "2024-02-15")])
+        []
+    """
+    missing = []
+    cursor_date, last_date = __to_date__(start_date), __to_date__(end_date)
+    for cov_start, cov_end in sorted(covered):
+        cov_start, cov_end = __to_date__(cov_start), __to_date__(cov_end)
+        if cov_end < cursor_date:
+            continue
+        if cov_start > last_date:
+            break
+        if cov_start > cursor_date:
+            missing.append((__to_str__(cursor_date), __to_str__(cov_start - timedelta(days=1))))
+        cursor_date = max(cursor_date, cov_end + timedelta(days=1))
+        if cursor_date > last_date:
+            break
+    if cursor_date <= last_date:
+        missing.append((__to_str__(cursor_date), __to_str__(last_date)))
+    return missing
+
+
+def __plan_windows__(start_date: str, end_date: str, covered: list = (), listing: tuple = (None, None),
+                     window_days: int = WINDOW_DAYS, recent_first: bool = True):
+    """
+    Plan the windows to download for one ticker.
+
+    Args:
+        start_date (str): First requested date ('YYYY-MM-DD').
+        end_date (str): Last requested date ('YYYY-MM-DD').
+        covered (list[tuple], optional): Ranges already stored locally.
+        listing (tuple, optional): (first_date, last_date) in which the ticker can have
+            quotes; None for an unknown bound.
+        window_days (int, optional): Maximum number of days of a window, bounds included.
+        recent_first (bool, optional): Order gaps and windows from the most recent one.
+
+    Returns:
+        list[tuple[tuple, list]]: (gap, windows) pairs. `gap` is a missing range; `windows`
+            cover its part inside the listing range and may be empty when the whole gap is
+            known to have no quotes (the gap can then be recorded as covered directly).
+
+    Examples:
+        >>> plan = __plan_windows__("2024-01-01", "2024-12-31", covered=[("2024-01-01", "2024-11-30")], window_days=20)
+        >>> plan
+        [(('2024-12-01', '2024-12-31'), [('2024-12-21', '2024-12-31'), ('2024-12-01', '2024-12-20')])]
+        >>> __plan_windows__("2010-01-01", "2010-12-31", listing=("2015-06-01", None))
+        [(('2010-01-01', '2010-12-31'), [])]
+        >>> __plan_windows__("2015-01-01", "2015-07-31", listing=("2015-06-01", None), recent_first=False)
+        [(('2015-01-01', '2015-07-31'), [('2015-06-01', '2015-07-31')])]
+    """
+    first_listed, last_listed = listing
+    plan = []
+    for gap in __subtract_ranges__(start_date, end_date, covered):
+        clip_start = max(gap[0], first_listed) if first_listed else gap[0]
+        clip_end = min(gap[1], last_listed) if last_listed else gap[1]
+        windows = __split_windows__(clip_start, clip_end, window_days) if clip_start <= clip_end else []
+        if recent_first:
+            windows.reverse()
+        plan.append((gap, windows))
+    if recent_first:
+        plan.reverse()
+    return plan
@@ -0,0 +1,235 @@
+"""
+Vectorized analytics over extracted market data.
+
+`MarketAnalytics` takes a `MarketDataOutput` (or its `by_col` frame) and works on the
+aligned date x ticker matrix of one field (Close by default) with NumPy: every
+statistic is computed for the whole universe in one pass, never column by column.
+
+Dates on which a ticker has no quote (NaN from the alignment of the universe) are
+skipped: a return is taken between two consecutive quotes of the ticker, and the
+rolling and pairwise statistics only use the observations that are present.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class MarketAnalytics:
+    """
+    Returns, volatility, drawdowns, beta and correlations of a universe of tickers.
+
+    Attributes:
+        field (str): Price field used ('Close' by default).
+        dates (pd.DatetimeIndex): Dates of the matrix.
+        symbols (list[str]): Tickers of the matrix, in the order of `by_col`.
+        prices (np.ndarray): Date x ticker matrix of the field, NaN where there is no quote.
+
+    Example:
+        data = MarketData().getData("BRVM", "all")
+        analytics = MarketAnalytics(data)
+        analytics.volatility(window=20)
+        analytics.beta(benchmark="BRVMC")
+    """
+
+    def __init__(self, data, field: str = "Close"):
+        """
+        Args:
+            data (MarketDataOutput | pd.DataFrame): Extracted data, or a wide frame with
+                one `SYMBOL.Field` column per ticker and field (like `by_col`).
+            field (str, optional): Field to analyse. Default is 'Close'.
+
+        Raises:
+            ValueError: If no column of the field is found.
+        """
+        by_col = getattr(data, "by_col", data)
+        suffix = "." + field
+        columns = [col for col in by_col.columns if col.endswith(suffix)]
+        if not columns:
+            raise ValueError(f"[Error] No '{field}' column in the data.")
+
+        self.field = field
+        self.dates = pd.DatetimeIndex(by_col.index)
+        self.symbols = [col[:-len(suffix)] for col in columns]
+        self.prices = by_col[columns].to_numpy(dtype="float64")
+        self._returns = {}
+
+    def __frame__(self, values):
+        return pd.DataFrame(values, index=self.dates, columns=self.symbols)
+
+    def __returns_matrix__(self, method="simple"):
+        """
+        Return the date x ticker matrix of returns between consecutive quotes (cached).
+        """
+        if method not in ("simple", "log"):
+            raise ValueError(f"[Error] the return method '{method}' is not supported.")
+        if method not in self._returns:
+            previous = np.vstack([np.full((1, self.prices.shape[1]), np.nan), __ffill__(self.prices)[:-1]])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = self.prices / previous
+                self._returns[method] = ratio - 1 if method == "simple" else np.log(ratio)
+        return self._returns[method]
+
+    def returns(self, method: str = "simple"):
+        """
+        Period returns of every ticker.
+
+        Args:
+            method (str, optional): 'simple' (default) or 'log'.
+
+        Returns:
+            pd.DataFrame: Date x ticker returns; NaN on dates without a quote and on each
+                ticker's first quote.
+        """
+        return self.__frame__(self.__returns_matrix__(method))
+
+    def volatility(self, window: int = 20, min_periods: int = None, annualize: int = 252, method: str = "simple"):
+        """
+        Rolling standard deviation of the returns.
+
+        Args:
+            window (int, optional): Number of dates of the window. Default is 20.
+            min_periods (int, optional): Minimum number of returns in a window. Default is `window // 2`.
+            annualize (int, optional): Periods per year used to annualize (sqrt rule); None or 0 keeps
+                the per-period volatility. Default is 252.
+            method (str, optional): Return method, 'simple' or 'log'.
+
+        Returns:
+            pd.DataFrame: Date x ticker volatility.
+        """
+        returns = self.__returns_matrix__(method)
+        min_periods = max(2, window // 2 if min_periods is None else min_periods)
+        count, total, squares = __rolling_sums__(returns, window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = (squares - total * total / count) / (count - 1)
+        volatility = np.sqrt(np.clip(variance, 0, None))
+        volatility[count < min_periods] = np.nan
+        if annualize:
+            volatility = volatility * np.sqrt(annualize)
+        return self.__frame__(volatility)
+
+    def drawdowns(self):
+        """
+        Drawdown of every ticker from its running peak.
+
+        Returns:
+            pd.DataFrame: Date x ticker drawdowns (0 at a peak, -0.25 for 25% below it);
+                NaN before a ticker's first quote.
+        """
+        prices = __ffill__(self.prices)
+        peaks = np.fmax.accumulate(prices, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.__frame__(prices / peaks - 1)
+
+    def max_drawdown(self):
+        """
+        Deepest drawdown of every ticker over the period.
+
+        Returns:
+            pd.Series: Maximum drawdown by ticker (a negative number, or 0).
+        """
+        return self.drawdowns().min()
+
+    def beta(self, benchmark: str = "BRVMC", window: int = None, min_periods: int = None, method: str = "simple"):
+        """
+        Beta of every ticker against a benchmark of the universe (the BRVM composite by default).
+
+        Only the dates on which both the ticker and the benchmark have a return are used.
+
+        Args:
+            benchmark (str, optional): Ticker used as the market. Default is 'BRVMC'.
+            window (int, optional): Rolling window in dates; None computes one beta over the whole period.
+            min_periods (int, optional): Minimum number of common returns. Default is `window // 2`
+                (rolling) or 2.
+            method (str, optional): Return method, 'simple' or 'log'.
+
+        Returns:
+            pd.Series | pd.DataFrame: Beta by ticker, or date x ticker rolling betas.
+
+        Raises:
+            ValueError: If the benchmark is not in the data.
+        """
+        if benchmark not in self.symbols:
+            raise ValueError(f"[Error] The benchmark '{benchmark}' is not in the data.")
+
+        returns = self.__returns_matrix__(method)
+        market = returns[:, [self.symbols.index(benchmark)]]
+        both = ~np.isnan(returns) & ~np.isnan(market)
+        x = np.where(both, returns, 0.0)
+        m = np.where(both, market, 0.0)
+        stacked = np.stack([both.astype("float64"), x, m, x * m, m * m])
+
+        if window is None:
+            sums = stacked.sum(axis=1)
+            threshold = 2 if min_periods is None else min_periods
+        else:
+            sums = __window_sums__(stacked, window, axis=1)
+            threshold = max(2, window // 2 if min_periods is None else min_periods)
+
+        count, sum_x, sum_m, sum_xm, sum_mm = sums
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = sum_xm - sum_x * sum_m / count
+            variance = sum_mm - sum_m * sum_m / count
+            beta = covariance / variance
+        beta[count < threshold] = np.nan
+
+        if window is None:
+            return pd.Series(beta, index=self.symbols)
+        return self.__frame__(beta)
+
+    def correlation(self, min_periods: int = 2, method: str = "simple"):
+        """
+        Correlation matrix of the returns, each pair over the dates both tickers have a return.
+
+        Args:
+            min_periods (int, optional): Minimum number of common returns of a pair. Default is 2.
+            method (str, optional): Return method, 'simple' or 'log'.
+
+        Returns:
+            pd.DataFrame: Ticker x ticker correlation matrix.
+        """
+        returns = self.__returns_matrix__(method)
+        valid = (~np.isnan(returns)).astype("float64")
+        x = np.nan_to_num(returns)
+
+        count = valid.T @ valid
+        sum_x = x.T @ valid               # [i, j]: sum of x_i where x_j is present too
+        sum_xx = (x * x).T @ valid
+        sum_xy = x.T @ x
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = sum_xy - sum_x * sum_x.T / count
+            variance_i = sum_xx - sum_x * sum_x / count
+            correlation = covariance / np.sqrt(variance_i * variance_i.T)
+        correlation[count < min_periods] = np.nan
+        np.fill_diagonal(correlation, np.where(np.diag(count) >= min_periods, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=self.symbols, columns=self.symbols)
+
+
+def __ffill__(values):
+    """
+    Forward-fill the NaN of a date x ticker matrix along the dates.
+    """
+    present = ~np.isnan(values)
+    last = np.where(present, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(last, axis=0, out=last)
+    return values[last, np.arange(values.shape[1])]
+
+
+def __window_sums__(values, window, axis=0):
+    """
+    Sum `values` over trailing windows of `window` positions along `axis` (cumulative sums).
+    """
+    values = np.moveaxis(values, axis, 0)
+    cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    upper = np.arange(1, values.shape[0] + 1)
+    lower = np.maximum(upper - window, 0)
+    return np.moveaxis(cumulative[upper] - cumulative[lower], 0, axis)
+
+
+def __rolling_sums__(values, window):
+    """
+    Rolling count, sum and sum of squares of the non-NaN values of a date x ticker matrix.
+    """
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    stacked = np.stack([present.astype("float64"), filled, filled * filled])
+    return __window_sums__(stacked, window, axis=1)
@@ -0,0 +1,120 @@
+"""
+The `marketflow` console command.
+
+    marketflow fetch BRVM --symbols all --start 2020-01-01 --workers 8 --format parquet --output-dir exports/
+    marketflow refresh --markets BRVM --now
+
+`fetch` downloads the symbols in parallel and writes each one to its own file as soon
+as it is complete (`<output-dir>/<SYMBOL>.<format>`), so memory holds only the symbols
+still in flight and an interrupted export keeps the files already written. It exits with
+1 when a symbol is incomplete or missing (run it again to request the missing dates).
+`refresh`
+runs the end-of-day refresher (see `marketflow.market_refresher`).
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+
+EXPORT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "jsonl": ".jsonl"}
+
+
+def __write_frame__(frame, path, fmt):
+    """
+    Write the frame of one symbol, atomically: the file only appears once it is complete.
+
+    Args:
+        frame (pd.DataFrame): Rows of the symbol, indexed by `Date` (like `MarketDataOutput.by_row`).
+        path (str): Destination file.
+        fmt (str): One of `EXPORT_FORMATS`.
+    """
+    frame = frame.assign(Ticker=frame["Ticker"].astype(str))
+    frame.index = frame.index.strftime("%Y-%m-%d")
+    tmp_path = path + ".tmp"
+    if fmt == "csv":
+        frame.to_csv(tmp_path)
+    elif fmt == "parquet":
+        frame.to_parquet(tmp_path)
+    else:
+        frame.reset_index().to_json(tmp_path, orient="records", lines=True)
+    os.replace(tmp_path, path)
+
+
+def __fetch__(args):
+    """
+    Run `marketflow fetch`: stream each symbol of the request to its own file.
+
+    Returns:
+        int: Exit code, 0 when every requested symbol was exported complete, 1 otherwise.
+    """
+    from marketflow.market_data import MarketData
+    from marketflow.market_registry import MarketRegistry
+
+    if args.format == "parquet":
+        try:
+            import pyarrow
+        except ImportError:
+            print("The parquet format needs pyarrow: pip install marketflow[columnar]", file=sys.stderr)
+            return 2
+
+    MarketRegistry()
+    os.makedirs(args.output_dir, exist_ok=True)
+    symbols = "all" if [symbol.upper() for symbol in args.symbols] == ["ALL"] else args.symbols
+
+    exported, failed = set(), set()
+    for symbol, frame in MarketData().iter_data(args.market.upper(), symbols, period=args.period,
+                                                start_date=args.start, end_date=args.end,
+                                                max_workers=args.workers, refresh=args.refresh,
+                                                resample=args.resample, failed=failed):
+        path = os.path.join(args.output_dir, symbol.split(".")[0] + EXPORT_FORMATS[args.format])
+        __write_frame__(frame, path, args.format)
+        exported.add(symbol.split(".")[0])
+        print(f"[Info] {path}: {frame.shape[0]} rows.")
+
+    print(f"[Info] {len(exported)} symbol(s) exported to {args.output_dir}.")
+    # incomplete symbols, plus the requested ones that were not exported at all
+    missing = {symbol.split(".")[0] for symbol in failed}
+    if symbols != "all":
+        missing.update(symbol.upper() for symbol in symbols if symbol.upper() not in exported)
+    if missing:
+        print(f"[Error] Incomplete or missing symbol(s): {', '.join(sorted(missing))}.", file=sys.stderr)
+        return 1
+    return 0 if exported else 1
+
+
+def main(argv=None):
+    """
+    Console entry point: `marketflow <command> [options]`.
+    """
+    parser = argparse.ArgumentParser(prog="marketflow", description="MarketFlow market data from the command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="download market data and write one file per symbol")
+    fetch.add_argument("market", help="market shortname (e.g. BRVM)")
+    fetch.add_argument("--symbols", nargs="+", default=["all"], help="ticker symbols, or 'all' (default)")
+    fetch.add_argument("--start", default=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                       help="first date, YYYY-MM-DD (default: 100 days ago)")
+    fetch.add_argument("--end", default=datetime.today().strftime("%Y-%m-%d"), help="last date, YYYY-MM-DD (default: today)")
+    fetch.add_argument("--period", default="daily", choices=["daily", "weekly", "monthly", "yearly"])
+    fetch.add_argument("--workers", type=int, default=4, help="concurrent downloads (default: 4)")
+    fetch.add_argument("--format", default="csv", choices=list(EXPORT_FORMATS), help="file format (default: csv)")
+    fetch.add_argument("--output-dir", default=".", help="directory of the files (default: current directory)")
+    fetch.add_argument("--refresh", action="store_true", help="download again the dates already stored locally")
+    fetch.add_argument("--resample", action="store_true", help="build weekly/monthly/yearly bars from the daily ones")
+
+    # options parsed by the refresher itself
+    commands.add_parser("refresh", add_help=False, help="refresh the local store after each market close")
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "refresh":
+        from marketflow.market_refresher import main as refresh_main
+        return refresh_main(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return __fetch__(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
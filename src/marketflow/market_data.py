@@ -1,15 +1,12 @@
-from marketflow.market_information import MarketInformation
-from marketflow.market_registry import MarketRegistry
 from marketflow.__db_manager__ import DBManager
-from bs4 import BeautifulSoup
+from marketflow.market_metrics import __span__, __recording__
+from marketflow.market_plugins import __get_extractor__
 from datetime import datetime,timedelta
-from tabulate import tabulate
-import requests
-import numpy as np
-import pandas as pd
 
-# specific link
-from marketflow.__marketconfig__.dataextraction import brvm_data
+
+# end of an extractor's iterator
+_DONE = object()
+
 
 class MarketData:
     """
@@ -17,15 +14,39 @@ class MarketData:
 
     Attributes:
         db_manager (DBManager): Database manager used to access market and ticker metadata.
+        cache (ColumnarCache | None): Optional columnar (Parquet/Feather) cache of the downloaded history.
+        metrics (MarketMetrics | None): Collector recording the spans and counters of every call.
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: str = None, cache_format: str = "parquet", metrics = None):
+        """
+        Args:
+            cache_dir (str, optional): Directory of a columnar cache of the downloaded history,
+                partitioned by market/period/symbol. The history is then read from (and kept in)
+                this cache instead of being rebuilt row by row from the local database.
+                Needs the optional `pyarrow` dependency (`pip install marketflow[columnar]`).
+            cache_format (str, optional): 'parquet' (default) or 'feather'.
+            metrics (MarketMetrics, optional): Collector of timings (HTTP, parsing, assembly,
+                database), bytes, retries and cache hits of every call made through this object.
+                Nothing is measured when it is None (default).
+        """
         self.db_manager = DBManager()
+        self.metrics = metrics
+        self.cache = None
+        if cache_dir is not None:
+            from marketflow.__columnar_cache__ import ColumnarCache
+            self.cache = ColumnarCache(cache_dir, fmt=cache_format)
                 
     def getData(self, market, symbols="all", period: str = 'daily',
                 start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
                 end_date=datetime.today().strftime("%Y-%m-%d"),
-                output_type=0):
+                output_type=0,
+                max_workers: int = 1,
+                refresh: bool = False,
+                float32: bool = False,
+                resample: bool = False,
+                progress = None,
+                output: str = None):
         """
         Retrieve historical data for a given market and a list of symbols.
 
@@ -36,33 +57,239 @@ class MarketData:
             start_date (str, optional): Start date (format: 'YYYY-MM-DD'). Default is 100 days before today.
             end_date (str, optional): End date (format: 'YYYY-MM-DD'). Default is today.
             output_type (int, optional): Reserved for formatting output (not fully implemented).
+            max_workers (int, optional): Number of concurrent downloads. Default is 1 (sequential).
+                Every (symbol, window) request is planned first, then run on a bounded thread pool;
+                the output is the same as the sequential one.
+            refresh (bool, optional): Download the whole range again instead of only the dates
+                missing from the local history store; cached responses (see `configure_http`)
+                are not read but replaced.
+            float32 (bool, optional): Store prices and volumes as float32 (half the memory of the
+                default float64).
+            resample (bool, optional): Derive 'weekly', 'monthly' and 'yearly' bars from the daily
+                history (first open, max high, min low, last close, summed volume) instead of
+                downloading each period separately. The daily bars are fetched once, then every
+                coarser period is built from the local store without any request.
+            progress (callable, optional): Called after each downloaded window with a dict
+                `{"done", "failed", "retried", "total"}` (windows). Failed windows are retried
+                after a backoff; the request rate can be capped with `configure_http(rate_limit=...)`.
+            output (str, optional): Build the rows directly in another format instead of pandas frames
+                (same columns and order as `by_row`, Ticker and Date included):
+                    - 'numpy': NumPy structured array (Date as datetime64[D]),
+                    - 'arrow': `pyarrow.Table` (`pip install marketflow[columnar]`),
+                    - 'polars': `polars.DataFrame` (`pip install marketflow[polars]`).
+                The prices are handed to Arrow and Polars without copying.
 
         Returns:
-            MarketDataOutput: An object containing row-based and column-based DataFrames of extracted data.
+            MarketDataOutput: An object containing row-based and column-based DataFrames of extracted data,
+                indexed by date (`datetime64`), with a categorical `Ticker` column in the row-based one;
+                or the rows in the `output` format.
 
         Raises:
             ValueError: If the market or period is not supported.
         """
 
+        output_format, output = output, None
         try:
-            output = None
-            
             if type(symbols) == str:
-                symbols = symbols.toupper()
+                symbols = symbols.upper()
             if type(symbols) == list:
                 symbols = [symbol.upper() for symbol in symbols]
             
             if market in self.db_manager.__market_list__():
                 
-                if market.upper() == "BRVM":
-                    output = brvm_data.__get_brvm_data__(market_shortname=market,symbols = symbols,period = period,start_date = start_date,end_date = end_date)
-                else:
+                # extractor registered for the market (its module is imported on first use)
+                extractor = __get_extractor__(market, "data")
+                if extractor is None:
                     raise ValueError(f"This market {market} is not supported yet.")
+                # the output format is only passed to the extractors when it is requested
+                options = {"output": output_format} if output_format is not None else {}
+                with __recording__(self.metrics), __span__("getData", market=market, period=period):
+                    output = extractor(market_shortname=market,symbols = symbols,period = period,start_date = start_date,end_date = end_date,max_workers = max_workers,refresh = refresh,cache = self.cache,float32 = float32,resample = resample,progress = progress,**options)
             else:
                 raise ValueError(f"[Error] The defined market '{market}' is not part of those configured")
             
+        except ImportError as e:
+            print(e)
         except Exception as e:
             print("Check if you have an active internet connection.")
         finally:
             return output
 
+
+
+    def query(self, market, symbols="all", start_date: str = None, end_date: str = None,
+              fields=("Open", "High", "Low", "Close", "Volume"), period: str = 'daily',
+              pivot: bool = False, float32: bool = False):
+        """
+        Read the locally stored history, without any request.
+
+        The symbol, date and field filters are applied by the local database (indexed by
+        ticker, period and date), so only the matching rows are read: a narrow query takes
+        milliseconds however long the stored history is. Use `getData` (or `MarketRefresher`)
+        to download the history first.
+
+        Args:
+            market (str): Shortname of the market (e.g., "BRVM").
+            symbols (list[str] | str, optional): Ticker symbols, or "all" (default).
+            start_date (str, optional): First date ('YYYY-MM-DD'). Default is the first stored date.
+            end_date (str, optional): Last date ('YYYY-MM-DD'). Default is the last stored date.
+            fields (list[str] | str, optional): Fields among 'Open', 'High', 'Low', 'Close', 'Volume'.
+                Default is all of them.
+            period (str, optional): Frequency of the data. Default is 'daily'.
+            pivot (bool, optional): Return one `SYMBOL.Field` column per symbol and field (like
+                `MarketDataOutput.by_col`) instead of one row per symbol and date (like `by_row`).
+            float32 (bool, optional): Return prices and volumes as float32.
+
+        Returns:
+            pd.DataFrame: The stored rows, indexed by date (`datetime64`), with a categorical
+                `Ticker` column (symbols in request order) unless `pivot` is set. Tickers are
+                labelled like in `getData`: the requested symbols, or the native tickers
+                (e.g., "BOAB.bj") with "all", so that both frames can be joined.
+
+        Raises:
+            ValueError: If the market is not configured or a field is unknown.
+
+        Example:
+            closes = MarketData().query("BRVM", ["BOAB", "SNTS"], "2024-01-01", "2024-06-30", fields="Close")
+        """
+        import numpy as np
+        import pandas as pd
+
+        if market not in self.db_manager.__market_list__():
+            raise ValueError(f"[Error] The defined market '{market}' is not part of those configured")
+        if isinstance(symbols, str):
+            symbols = None if symbols.upper() == "ALL" else [symbols]
+        if symbols is not None:
+            symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if isinstance(fields, str):
+            fields = [fields]
+        columns = [field.capitalize() for field in fields]
+
+        with __recording__(self.metrics), __span__("query", market=market, period=period):
+            # tickers labelled like getData: the requested symbols, or the native tickers with "all"
+            rows = self.db_manager.__query_price_history__(market, symbols, period, start_date, end_date,
+                                                           [field.lower() for field in fields], full_symbols=symbols is None)
+            # one typed array per column, straight from the rows (no intermediate object frame)
+            values = list(zip(*rows)) if rows else [()] * (len(columns) + 2)
+            categories = symbols if symbols is not None else list(dict.fromkeys(values[0]))
+            data = {col: np.array(values[i + 2], dtype="float32" if float32 else "float64") for i, col in enumerate(columns)}
+            data["Ticker"] = pd.Categorical(values[0], categories=categories)
+            frame = pd.DataFrame(data, index=pd.DatetimeIndex(pd.to_datetime(list(values[1]), format="%Y-%m-%d"), name="Date"))
+
+            if pivot:
+                frame = frame.set_index("Ticker", append=True)[columns].unstack("Ticker").sort_index()
+                frame = frame.reindex(columns=pd.MultiIndex.from_tuples([(col, symbol) for symbol in categories for col in columns]))
+                frame.columns = [symbol + "." + col for col, symbol in frame.columns]
+        return frame
+
+
+    def iter_data(self, market, symbols="all", period: str = 'daily',
+                start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                end_date=datetime.today().strftime("%Y-%m-%d"),
+                max_workers: int = 1,
+                refresh: bool = False,
+                float32: bool = False,
+                resample: bool = False,
+                progress = None,
+                failed: set = None):
+        """
+        Stream historical data for a given market, yielding each symbol as soon as it is fetched.
+
+        Unlike `getData`, nothing is merged: each symbol's frame is handed over once all its
+        windows are downloaded (and saved in the local history store), so memory stays bounded
+        by the symbols in flight and a failure late in a run keeps the symbols already yielded.
+
+        Args:
+            failed (set, optional): Filled with the symbols whose data is incomplete: some of their
+                windows could not be downloaded (they are requested again by the next call), or the
+                stream stopped on an error before them. Empty when every symbol is complete.
+            Other arguments: same as `getData`.
+
+        Yields:
+            tuple[str, pd.DataFrame]: (symbol, frame) pairs. The frame is shaped like
+                `MarketDataOutput.by_row` (Date index; Open, High, Low, Close, Volume, Ticker).
+                Symbols come in request order with `max_workers=1`, in completion order otherwise.
+        """
+
+        try:
+            if type(symbols) == str:
+                symbols = symbols.upper()
+            if type(symbols) == list:
+                symbols = [symbol.upper() for symbol in symbols]
+            
+            if market in self.db_manager.__market_list__():
+                
+                # extractor registered for the market (its module is imported on first use)
+                extractor = __get_extractor__(market, "iter_data")
+                if extractor is None:
+                    raise ValueError(f"This market {market} is not supported yet.")
+                # the failed set is only passed to the extractors when it is requested
+                options = {"failed": failed} if failed is not None else {}
+                iterator = extractor(market_shortname=market,symbols = symbols,period = period,start_date = start_date,end_date = end_date,max_workers = max_workers,refresh = refresh,cache = self.cache,float32 = float32,resample = resample,progress = progress,**options)
+                # record each step of the extraction only: the consumer's code between two symbols is not measured
+                try:
+                    while True:
+                        with __recording__(self.metrics):
+                            item = next(iterator, _DONE)
+                        if item is _DONE:
+                            break
+                        yield item
+                finally:
+                    with __recording__(self.metrics):
+                        iterator.close()
+            else:
+                raise ValueError(f"[Error] The defined market '{market}' is not part of those configured")
+            
+        except Exception as e:
+            print("Check if you have an active internet connection.")
+
+
+    async def agetData(self, market, symbols="all", period: str = 'daily',
+                start_date=(datetime.today() - timedelta(100)).strftime("%Y-%m-%d"),
+                end_date=datetime.today().strftime("%Y-%m-%d"),
+                concurrency: int = 8,
+                refresh: bool = False,
+                float32: bool = False,
+                resample: bool = False,
+                progress = None,
+                output: str = None):
+        """
+        Awaitable counterpart of `getData`, for use inside an asyncio event loop.
+
+        Requests are sent with a non-blocking HTTP client (optional `httpx` dependency,
+        `pip install marketflow[async]`), so the event loop is never blocked and several
+        markets or symbol lists can be fetched concurrently with `asyncio.gather`.
+
+        Args:
+            concurrency (int, optional): Maximum number of requests in flight. Default is 8.
+            Other arguments: same as `getData`.
+
+        Returns:
+            MarketDataOutput: Same as `getData`.
+        """
+        import asyncio
+
+        output_format, output = output, None
+        try:
+            if type(symbols) == str:
+                symbols = symbols.upper()
+            if type(symbols) == list:
+                symbols = [symbol.upper() for symbol in symbols]
+            
+            if market in await asyncio.to_thread(self.db_manager.__market_list__):
+                
+                # extractor registered for the market (its module is imported on first use)
+                extractor = __get_extractor__(market, "adata")
+                if extractor is None:
+                    raise ValueError(f"This market {market} is not supported yet.")
+                options = {"output": output_format} if output_format is not None else {}
+                with __recording__(self.metrics), __span__("agetData", market=market, period=period):
+                    output = await extractor(market_shortname=market,symbols = symbols,period = period,start_date = start_date,end_date = end_date,concurrency = concurrency,refresh = refresh,cache = self.cache,float32 = float32,resample = resample,progress = progress,**options)
+            else:
+                raise ValueError(f"[Error] The defined market '{market}' is not part of those configured")
+            
+        except ImportError as e:
+            print(e)
+        except Exception as e:
+            print("Check if you have an active internet connection.")
+        return output
@@ -0,0 +1,267 @@
+"""
+Structured metrics and tracing of marketflow runs.
+
+The extractors report timed spans (HTTP calls, parsing, assembly, database operations)
+and counters (requests, bytes, retries, cache hits and misses) through `__span__` and
+`__count__`. Nothing is recorded unless a `MarketMetrics` collector is active: the
+disabled path is a single context variable lookup.
+
+Collectors are active in a context (`contextvars`), not in the whole process: a
+collector only sees the calls made inside its own `with` block, including the worker
+threads and asyncio tasks those calls start, and never the calls of other threads or
+tasks running at the same time.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# collectors recording in the current context (a collector enabled n times appears n times)
+_active = contextvars.ContextVar("marketflow_metrics", default=())
+
+
+class _Span:
+    """
+    A timed section of a run, recorded by every active collector when it ends.
+    """
+
+    __slots__ = ("name", "attrs", "start", "collectors")
+
+    def __init__(self, name, attrs, collectors):
+        self.name = name
+        self.attrs = attrs
+        self.collectors = collectors
+
+    def set(self, **attrs):
+        """
+        Attach attributes known only inside the span (status code, bytes, rows, ...).
+        """
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        for collector in self.collectors:
+            collector.__record_span__(self.name, self.start, duration, self.attrs)
+        return False
+
+
+class _NoopSpan:
+    """
+    Span used when no collector is active: does nothing.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def __span__(name: str, **attrs):
+    """
+    Open a timed span, e.g. `with __span__("db.save", rows=10) as span: ...`.
+
+    Returns:
+        _Span | _NoopSpan: A context manager; its `set(**attrs)` adds attributes.
+    """
+    active = _active.get()
+    if not active:
+        return _NOOP_SPAN
+    return _Span(name, attrs, tuple(dict.fromkeys(active)))
+
+
+def __recording__(metrics):
+    """
+    Context manager recording into `metrics` (a `MarketMetrics`), or doing nothing if it is None.
+    """
+    return metrics if metrics is not None else _NOOP_SPAN
+
+
+def __count__(name: str, value: float = 1):
+    """
+    Add `value` to a counter of every active collector.
+    """
+    active = _active.get()
+    if not active:
+        return
+    for collector in dict.fromkeys(active):
+        collector.__record_count__(name, value)
+
+
+class MarketMetrics:
+    """
+    A collector of the spans and counters reported during marketflow calls.
+
+    Use it as a context manager around any calls, or pass it to `MarketData` /
+    `MarketTickers` so that only their calls are recorded:
+
+        metrics = MarketMetrics()
+        data = MarketData(metrics=metrics)
+        data.getData("BRVM", "all")
+        print(metrics.summary())
+        metrics.export_json("trace.json")
+
+    Attributes:
+        spans (deque[dict]): Finished spans: name, start and duration (seconds), thread, attributes.
+        counters (dict[str, float]): Counters by name (e.g. `http.requests`, `http.bytes`,
+            `http.retries`, `store.hits`, `cache.misses`).
+        hooks (list[callable]): Callbacks receiving every event as a dict with a `type`
+            key ('span' or 'counter').
+        max_spans (int | None): Keep at most this many spans (oldest dropped); counters are always kept.
+    """
+
+    def __init__(self, hooks: list = None, max_spans: int = 100000):
+        self.spans = deque(maxlen=max_spans)
+        self.counters = {}
+        self.hooks = list(hooks) if hooks else []
+        self.max_spans = max_spans
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_hook(self, callback):
+        """
+        Register a callback called with each span or counter event (dict).
+        """
+        self.hooks.append(callback)
+
+    def enable(self):
+        """
+        Start recording in the current context (thread or asyncio task). Calls can be
+        nested: recording stops after the matching `disable`.
+        """
+        _active.set(_active.get() + (self,))
+        return self
+
+    def disable(self):
+        """
+        Stop recording in the current context (see `enable`).
+        """
+        active = list(_active.get())
+        for index in range(len(active) - 1, -1, -1):
+            if active[index] is self:
+                del active[index]
+                _active.set(tuple(active))
+                break
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disable()
+        return False
+
+    def reset(self):
+        """
+        Forget every recorded span and counter.
+        """
+        with self._lock:
+            self.spans = deque(maxlen=self.max_spans)
+            self.counters = {}
+
+    def __record_span__(self, name, start, duration, attrs):
+        event = {
+            "type": "span",
+            "name": name,
+            "start": start - self._origin,
+            "duration": duration,
+            "thread": threading.get_ident(),
+            "attrs": attrs,
+        }
+        with self._lock:
+            self.spans.append(event)
+        self.__notify__(event)
+
+    def __record_count__(self, name, value):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        if self.hooks:
+            self.__notify__({"type": "counter", "name": name, "value": value})
+
+    def __notify__(self, event):
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                # a failing hook must never break a download
+                pass
+
+    def summary(self):
+        """
+        Aggregate the spans by name.
+
+        Returns:
+            dict: {"spans": {name: {"count", "total", "mean", "max"}}, "counters": {...}},
+                durations in seconds.
+        """
+        stats = {}
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        for span in spans:
+            entry = stats.setdefault(span["name"], {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += span["duration"]
+            entry["max"] = max(entry["max"], span["duration"])
+        for entry in stats.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return {"spans": stats, "counters": counters}
+
+    def export_json(self, path: str):
+        """
+        Write the spans and counters to a JSON trace file.
+
+        The file uses the Trace Event format (`traceEvents`), so it opens directly in
+        chrome://tracing or Perfetto; the counters are kept under `counters`.
+
+        Args:
+            path (str): Destination file.
+        """
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {
+                    "name": span["name"],
+                    "ph": "X",
+                    "ts": span["start"] * 1e6,
+                    "dur": span["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": span["thread"],
+                    "args": span["attrs"],
+                }
+                for span in spans
+            ],
+            "displayTimeUnit": "ms",
+            "counters": counters,
+        }
+        with open(path, "w") as fp:
+            json.dump(trace, fp, default=str)
+
+    def __str__(self):
+        summary = self.summary()
+        lines = ["======= METRICS ======="]
+        for name, entry in sorted(summary["spans"].items()):
+            lines.append(f"{name:24} {entry['count']:6d} x  total {entry['total'] * 1000:10.1f} ms  max {entry['max'] * 1000:8.1f} ms")
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f"{name:24} {value:g}")
+        return "\n".join(lines)
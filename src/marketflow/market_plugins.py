@@ -0,0 +1,150 @@
+"""
+Registry of the market extractors.
+
+Each market registers the functions that extract its tickers and its data. They are
+given as "module:function" strings and imported only when the market is first used,
+so a market that is never requested costs neither import time nor memory.
+
+Third parties can add a market in two ways:
+
+    - call `register_market` at runtime:
+
+        from marketflow.market_plugins import register_market
+        register_market("NGX", tickers="ngx_plugin:get_tickers", data="ngx_plugin:get_data",
+                        information=MarketInformation("NGX", "Nigerian Exchange", ...))
+
+    - or declare an entry point in the `marketflow.markets` group, named after the
+      market shortname and pointing to a dict with the same keys as `register_market`:
+
+        [project.entry-points."marketflow.markets"]
+        NGX = "ngx_plugin:MARKETFLOW_PLUGIN"
+
+      Entry points are only read when a market without registration is requested.
+
+Extractor contracts (called with keyword arguments):
+
+    - tickers(market_shortname, use_web) -> [INDEXES rows, SHARES rows], saved in the local database,
+    - data(market_shortname, symbols, period, start_date, end_date, **options) -> MarketDataOutput
+      (`output` is only among the options when another format is requested, see `__output_backends__`),
+    - iter_data(...) -> iterator of (symbol, frame), same arguments as `data` (`failed`, a set to
+      fill with the symbols left incomplete, is only among the options when the caller asks for it),
+    - atickers / adata: awaitable counterparts of `tickers` / `data`.
+"""
+
+import importlib
+import threading
+
+
+EXTRACTOR_KINDS = ("tickers", "atickers", "data", "iter_data", "adata")
+
+ENTRY_POINT_GROUP = "marketflow.markets"
+
+_registry = {
+    "BRVM": {
+        "tickers": "marketflow.__marketconfig__.tickerextraction.brvm_ticker:__get_tickers__",
+        "atickers": "marketflow.__marketconfig__.tickerextraction.brvm_ticker:__aget_tickers__",
+        "data": "marketflow.__marketconfig__.dataextraction.brvm_data:__get_brvm_data__",
+        "iter_data": "marketflow.__marketconfig__.dataextraction.brvm_data:__iter_brvm_data__",
+        "adata": "marketflow.__marketconfig__.dataextraction.brvm_data:__aget_brvm_data__",
+    },
+    "BVC": {
+        "tickers": "marketflow.__marketconfig__.tickerextraction.bvc_ticker:__get_tickers__",
+    },
+}
+_entry_points_loaded = False
+_registry_lock = threading.Lock()
+
+
+def register_market(shortname: str, tickers = None, data = None, iter_data = None, atickers = None, adata = None,
+                    information = None, replace: bool = False):
+    """
+    Register the extractors of a market.
+
+    Args:
+        shortname (str): Shortname of the market (e.g., "NGX").
+        tickers, data, iter_data, atickers, adata (callable | str, optional): Extractors, as
+            callables or "module:function" strings imported on first use (see the module docstring).
+        information (MarketInformation, optional): Description of the market, added to the
+            local database so that it is part of the configured markets.
+        replace (bool, optional): Replace the extractors already registered for this market.
+            By default only the missing ones are added.
+
+    Raises:
+        ValueError: If no extractor is given.
+    """
+    extractors = {
+        kind: target for kind, target in zip(EXTRACTOR_KINDS, (tickers, atickers, data, iter_data, adata))
+        if target is not None
+    }
+    if not extractors:
+        raise ValueError(f"[Error] No extractor given for the market '{shortname}'.")
+
+    with _registry_lock:
+        entry = _registry.setdefault(shortname.upper(), {})
+        for kind, target in extractors.items():
+            if replace or kind not in entry:
+                entry[kind] = target
+
+    if information is not None:
+        from marketflow.__db_manager__ import DBManager
+
+        DBManager().__addmarket_to_local_db__(market=information)
+
+
+def registered_markets():
+    """
+    List the markets that have at least one registered extractor.
+
+    Returns:
+        list[str]: Market shortnames.
+    """
+    __load_entry_points__()
+    return sorted(_registry)
+
+
+def __get_extractor__(shortname: str, kind: str):
+    """
+    Return an extractor of a market, importing its module on first use.
+
+    Args:
+        shortname (str): Shortname of the market.
+        kind (str): One of `EXTRACTOR_KINDS`.
+
+    Returns:
+        callable | None: The extractor, or None if the market does not provide it.
+    """
+    shortname = shortname.upper()
+    if shortname not in _registry:
+        __load_entry_points__()
+
+    entry = _registry.get(shortname)
+    if entry is None or entry.get(kind) is None:
+        return None
+
+    target = entry[kind]
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(":")
+        target = getattr(importlib.import_module(module_name), attribute)
+        with _registry_lock:
+            entry[kind] = target
+    return target
+
+
+def __load_entry_points__():
+    """
+    Register the markets declared by installed packages (once per process).
+    """
+    global _entry_points_loaded
+
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            plugin = entry_point.load()
+            register_market(entry_point.name, **plugin)
+        except Exception:
+            print(f"[WARN] The market plugin '{entry_point.name}' could not be loaded.")
@@ -0,0 +1,208 @@
+"""
+End-of-day refresh of the local store.
+
+`MarketRefresher` updates the ticker universe and the latest bars of the configured
+markets once their session is over, so that the `getData` calls made during the day
+are served from the local store without any request.
+
+It runs in the calling process (`refresh()` once, `run()` on a schedule, `start()` in a
+background thread) or as a console command:
+
+    marketflow-refresh                      # every configured market, after each close
+    marketflow-refresh --markets BRVM --now # one refresh right away, then exit
+"""
+
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from marketflow.market_metrics import __span__, __recording__
+
+
+class MarketRefresher:
+    """
+    Refresh the tickers and the latest bars of markets after their session closes.
+
+    Attributes:
+        markets (list[str]): Markets refreshed (default: every configured market with an extractor).
+        periods (list[str]): Periods of the bars refreshed.
+        lookback_days (int): Number of days before today checked at each refresh; only the
+            dates missing from the local store are downloaded.
+        max_workers (int): Number of concurrent downloads.
+        refresh_times (dict): UTC time ('HH:MM') of the refresh of each market.
+        metrics (MarketMetrics | None): Collector recording the spans and counters of every refresh.
+
+    Example:
+        refresher = MarketRefresher(markets=["BRVM"], max_workers=4)
+        refresher.start()       # refreshes every weekday at 16:00 UTC, in a background thread
+        ...
+        refresher.stop()
+    """
+
+    # sessions end at 15:00 GMT (BRVM) and 15:30 Casablanca time (BVC); bars are published shortly after
+    REFRESH_TIMES = {"BRVM": "16:00", "BVC": "15:30"}
+    DEFAULT_REFRESH_TIME = "18:00"
+
+    def __init__(self, markets: list = None, periods: list = ("daily",), lookback_days: int = 10,
+                 max_workers: int = 4, refresh_times: dict = None, cache_dir: str = None, metrics = None):
+        """
+        Args:
+            markets (list[str], optional): Markets to refresh. Default is every configured market
+                with a registered extractor.
+            periods (list[str], optional): Periods of the bars to refresh. Default is daily only.
+            lookback_days (int, optional): Days before today checked at each refresh. Default is 10.
+            max_workers (int, optional): Number of concurrent downloads. Default is 4.
+            refresh_times (dict, optional): UTC refresh time ('HH:MM') by market, overriding
+                `REFRESH_TIMES`.
+            cache_dir (str, optional): Columnar cache kept up to date as well (see `MarketData`).
+            metrics (MarketMetrics, optional): Collector of timings and counters of every refresh.
+        """
+        from marketflow.market_data import MarketData
+        from marketflow.market_registry import MarketRegistry
+        from marketflow.market_ticker import MarketTickers
+        from marketflow.market_plugins import registered_markets
+
+        configured = MarketRegistry().market_list() or []
+        if markets is None:
+            supported = registered_markets()
+            markets = [market for market in configured if market in supported]
+        else:
+            markets = [market.upper() for market in markets]
+            for market in markets:
+                if market not in configured:
+                    raise ValueError(f"[Error] The defined market '{market}' is not part of those configured")
+
+        self.markets = markets
+        self.periods = list(periods)
+        self.lookback_days = lookback_days
+        self.max_workers = max_workers
+        self.refresh_times = {**self.REFRESH_TIMES, **{k.upper(): v for k, v in (refresh_times or {}).items()}}
+        self.metrics = metrics
+        self.tickers = MarketTickers(metrics=metrics)
+        self.data = MarketData(cache_dir=cache_dir, metrics=metrics)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self, markets: list = None):
+        """
+        Refresh the tickers and the latest bars of the markets now.
+
+        Args:
+            markets (list[str], optional): Markets to refresh. Default is `markets`.
+
+        Returns:
+            dict: Number of symbols refreshed by market and period, e.g. {"BRVM": {"daily": 47}}.
+        """
+        from marketflow.market_plugins import __get_extractor__
+
+        today = datetime.today()
+        start_date = (today - timedelta(days=self.lookback_days)).strftime("%Y-%m-%d")
+        end_date = today.strftime("%Y-%m-%d")
+
+        summary = {}
+        for market in markets or self.markets:
+            summary[market] = {}
+            with __recording__(self.metrics), __span__("refresh", market=market):
+                # a conditional request: the universe is only downloaded again if it changed
+                self.tickers.getTickers(market, force_refresh=True)
+                if __get_extractor__(market, "iter_data") is None:
+                    continue
+                for period in self.periods:
+                    summary[market][period] = sum(
+                        1 for _ in self.data.iter_data(market, "all", period=period, start_date=start_date,
+                                                       end_date=end_date, max_workers=self.max_workers)
+                    )
+            print(f"[Info] {market} refreshed at {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC: {summary[market]}.")
+        return summary
+
+    def next_run(self, market: str, now: datetime = None):
+        """
+        Return the next scheduled refresh of a market (weekdays only, after its close).
+
+        Args:
+            market (str): Shortname of the market.
+            now (datetime, optional): Current time (UTC). Default is now.
+
+        Returns:
+            datetime: Time of the next refresh (UTC).
+        """
+        now = now or datetime.now(timezone.utc)
+        hour, minute = map(int, self.refresh_times.get(market, self.DEFAULT_REFRESH_TIME).split(":"))
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        while run_at.weekday() >= 5:
+            run_at += timedelta(days=1)
+        return run_at
+
+    def run(self):
+        """
+        Refresh each market after every close until `stop()` is called (blocking).
+        """
+        self._stop.clear()
+        schedule = {market: self.next_run(market) for market in self.markets}
+        while schedule and not self._stop.is_set():
+            market = min(schedule, key=schedule.get)
+            delay = (schedule[market] - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            try:
+                self.refresh([market])
+            except Exception:
+                # a failed refresh is tried again at the next close; the local store is left as is
+                print(f"[WARN] The refresh of {market} failed.")
+            schedule[market] = self.next_run(market)
+
+    def start(self):
+        """
+        Run the schedule in a background (daemon) thread.
+
+        Returns:
+            MarketRefresher: self.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="marketflow-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Stop the schedule; a refresh in progress finishes first.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def main(argv=None):
+    """
+    Console entry point: `marketflow-refresh [--markets BRVM ...] [--now]`.
+    """
+    parser = argparse.ArgumentParser(prog="marketflow-refresh",
+                                     description="Keep the local MarketFlow store up to date after each market close.")
+    parser.add_argument("--markets", nargs="+", help="markets to refresh (default: every configured market)")
+    parser.add_argument("--periods", nargs="+", default=["daily"], choices=["daily", "weekly", "monthly", "yearly"])
+    parser.add_argument("--lookback-days", type=int, default=10, help="days before today checked at each refresh")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent downloads")
+    parser.add_argument("--cache-dir", help="columnar cache kept up to date as well")
+    parser.add_argument("--now", action="store_true", help="refresh once right away and exit")
+    args = parser.parse_args(argv)
+
+    refresher = MarketRefresher(markets=args.markets, periods=args.periods, lookback_days=args.lookback_days,
+                                max_workers=args.workers, cache_dir=args.cache_dir)
+    if args.now:
+        refresher.refresh()
+        return 0
+
+    for market in refresher.markets:
+        print(f"[Info] Next refresh of {market}: {refresher.next_run(market):%Y-%m-%d %H:%M} UTC.")
+    try:
+        refresher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,3 @@
-from tabulate import tabulate
 from marketflow.market_information import MarketInformation
 from marketflow.__db_manager__ import DBManager
 
@@ -54,6 +53,8 @@ class MarketRegistry():
             
     def describe(self):
         """Describe all registered markets."""
+        from tabulate import tabulate
+        
         print(f"======= WELCOME TO MARKETFLOW PyEdition {self.version} (R) =======\n")
         print(f"Note : Currently {len(self.markets)} markets are configured on MarketFlow.\n")
         print("=== AVAILABLE STOCK MARKETS ===")
@@ -63,10 +64,30 @@ class MarketRegistry():
             headers = ["ID","Shortname","Fullname","Official URL","Creation date"]
             print(tabulate(table,headers=headers,tablefmt="fancy_grid"))
             
-    def purge(self):
-        """Delete all from locale database."""
-        
-        self.db_manager.__delete_table__(["market","ticker"])
+    def purge(self, cache_dir: str = None):
+        """
+        Delete all from locale database.
+
+        The stored history, its coverage and the refresh state go with the markets and the
+        tickers: their ids are handed out again afterwards, so no row keyed by an old id may
+        be left behind (a re-scraped ticker would otherwise inherit another one's history).
+
+        Args:
+            cache_dir (str, optional): Directory of a columnar cache (see `MarketData`) whose
+                partitions of the configured markets are deleted as well.
+        """
+        import os
+        import shutil
+        from marketflow.market_ticker import _tickers_memo, _tickers_memo_lock
+
+        if cache_dir is not None:
+            for market in self.market_list() or []:
+                shutil.rmtree(os.path.join(cache_dir, market), ignore_errors=True)
+        self.db_manager.__delete_table__(["market","ticker","price_history","price_history_coverage","price_history_version","market_refresh","http_validator"])
+        # the tickers memoized in this process belonged to the deleted universe
+        with _tickers_memo_lock:
+            for memo_key in [key for key in _tickers_memo if key[0] == self.db_manager.db_path]:
+                del _tickers_memo[memo_key]
         # self.db_manager.__init__()
         # self.__setup_market__()
         
\ No newline at end of file
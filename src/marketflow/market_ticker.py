@@ -1,11 +1,25 @@
 from marketflow.__db_manager__ import DBManager
-from tabulate import tabulate
+from marketflow.market_metrics import __span__, __count__, __recording__
+from marketflow.market_plugins import __get_extractor__
+from datetime import datetime, timedelta
+import threading
 
 
-# specific link
-from marketflow.__marketconfig__.tickerextraction import brvm_ticker
+# in-process memo of the last MarketTickersOutput per (database, market)
+_tickers_memo = {}
+_tickers_memo_lock = threading.Lock()
 
 
+def __tickers_as__(tickers, output):
+    """
+    Return a `MarketTickersOutput` as is, or its universe in another output format (see `__output_backends__`).
+    """
+    if output is None or not tickers:
+        return tickers
+    from marketflow.__output_backends__ import __ticker_output__
+    
+    return __ticker_output__(tickers.ticker_database, output)
+
 
 class MarketTickersOutput:
     """
@@ -29,6 +43,8 @@ class MarketTickersOutput:
         self.seperator = ", "
         
     def __str__(self):
+        from tabulate import tabulate
+        
         return(
             "======= ALL TICKERS =======\n"
             f"{self.seperator.join(self.ticker_list)}.\n\n"
@@ -46,9 +62,21 @@ class MarketTickers:
     Attributes:
         tickers_headers (list[str]): Column headers used to describe ticker information.
         db_manager (DBManager): Database manager to query stored market and ticker metadata.
+        ttl (timedelta): How long a downloaded ticker list is reused before being scraped again.
+        metrics (MarketMetrics | None): Collector recording the spans and counters of every call.
     """
-    def __init__(self):
+    
+    DEFAULT_TTL = timedelta(hours=24)
+    
+    def __init__(self, ttl: float = None, metrics = None):
+        """
+        Args:
+            ttl (float, optional): Lifetime of the ticker universe in seconds. Default is 24 hours.
+            metrics (MarketMetrics, optional): Collector of timings and counters of every call.
+        """
         self.db_manager = DBManager()
+        self.ttl = self.DEFAULT_TTL if ttl is None else timedelta(seconds=ttl)
+        self.metrics = metrics
         # for market in self.db_manager.__market_list__():
         #     self.getTickers(market=market)
 
@@ -63,7 +91,7 @@ class MarketTickers:
         """
         try:
             output = []
-            if self.db_manager.__ticker_list__(market_shortname=market) == None:
+            if not self.db_manager.__ticker_list__(market_shortname=market) or not self.__is_fresh__(market):
                 self.getTickers(market=market)
             output = self.db_manager.__ticker_list__(market_shortname=market)
         except Exception as e:
@@ -72,10 +100,15 @@ class MarketTickers:
             return(output)
         
         
-    def getTickers(self, market):
+    def getTickers(self, market, force_refresh: bool = False, output: str = None):
         """
         Retrieve ticker information for a given market.
 
+        The ticker universe is scraped again only when the stored list is older than
+        `ttl` (see `tickers_refreshed_at` in the local database) or when `force_refresh`
+        is set. Otherwise the list is read from the local database, and repeated calls in
+        the same process reuse the previous result.
+
         If the market exists in the local database and is supported,
         the method returns both:
             - A simple list of ticker symbols.
@@ -83,6 +116,9 @@ class MarketTickers:
 
         Args:
             market (str): The shortname of the market (e.g., "BRVM").
+            force_refresh (bool, optional): Scrape the ticker list even if the stored one is fresh.
+            output (str, optional): 'numpy', 'arrow' or 'polars' to get one row per ticker
+                (Type, Symbol, FullSymbol, Description, Country) in that format instead.
 
         Returns:
             MarketTickersOutput: An object containing:
@@ -93,34 +129,117 @@ class MarketTickers:
             ValueError: If the market is not supported or not found in the local database.
 
         Notes:
-            Currently, only the BRVM market is supported.
+            Markets are served by the extractors registered in `marketflow.market_plugins`
+            (BRVM and BVC built in; see `register_market` to add one).
         """
 
+        output_format = output
         try:
             output = {}
+            if output_format is not None:
+                from marketflow.__output_backends__ import __check_output__
+                __check_output__(output_format)
+            
+            memo_key = (self.db_manager.db_path, market)
+            fresh = not force_refresh and self.__is_fresh__(market)
+            if fresh and memo_key in _tickers_memo:
+                with __recording__(self.metrics):
+                    __count__("tickers.memo_hits")
+                return __tickers_as__(_tickers_memo[memo_key], output_format)
             
             if market in self.db_manager.__market_list__():
-                if market.upper() == "BRVM":
+                # extractor registered for the market (its module is imported on first use)
+                extractor = __get_extractor__(market, "tickers")
+                if extractor is None:
+                    raise ValueError(f"This market {market} is not supported yet.")
+                with __recording__(self.metrics), __span__("getTickers", market=market, scrape=not fresh):
                     output = MarketTickersOutput(
-                        ticker_database= brvm_ticker.__get_tickers__(market_shortname=market),
+                        ticker_database= extractor(market_shortname=market,use_web=not fresh),
                         index_ticker_list = self.db_manager.__ticker_list__(market_shortname=market,type="INDEX"),
                         share_ticker_list = self.db_manager.__ticker_list__(market_shortname=market,type="SHARE")
                     )
-                    
-                    
-                else:
-                    raise ValueError(f"This market {market} is not supported yet.")
+                
+                # memoize only a list that is known to be fresh
+                if self.__is_fresh__(market):
+                    with _tickers_memo_lock:
+                        _tickers_memo[memo_key] = output
     
             else:
                 raise ValueError(f"[Error] the defined market '{market}' is not part of those configured")
             
             
-            return output
+            return __tickers_as__(output, output_format)
+        except ImportError as e:
+            print(e)
         except Exception as e:
             print("Check if you have an active internet connection.")
             #print(e)
         
         
+    async def agetTickers(self, market, force_refresh: bool = False, output: str = None):
+        """
+        Awaitable counterpart of `getTickers`.
+
+        The ticker page is downloaded with a non-blocking HTTP client (optional `httpx`
+        dependency), so several markets can be refreshed from one event loop.
+
+        Args:
+            market (str): The shortname of the market (e.g., "BRVM").
+            force_refresh (bool, optional): Scrape the ticker list even if the stored one is fresh.
+            output (str, optional): Same as `getTickers`.
+
+        Returns:
+            MarketTickersOutput: Same as `getTickers`.
+        """
+        import asyncio
+
+        output_format = output
+        try:
+            output = {}
+            if output_format is not None:
+                from marketflow.__output_backends__ import __check_output__
+                __check_output__(output_format)
+            
+            # the local database is read in worker threads: a locked database never blocks the event loop
+            memo_key = (self.db_manager.db_path, market)
+            fresh = not force_refresh and await asyncio.to_thread(self.__is_fresh__, market)
+            if fresh and memo_key in _tickers_memo:
+                with __recording__(self.metrics):
+                    __count__("tickers.memo_hits")
+                return __tickers_as__(_tickers_memo[memo_key], output_format)
+            
+            if market in await asyncio.to_thread(self.db_manager.__market_list__):
+                # awaitable extractor if the market has one, else the blocking one in a worker thread
+                extractor = __get_extractor__(market, "atickers")
+                if extractor is None and __get_extractor__(market, "tickers") is None:
+                    raise ValueError(f"This market {market} is not supported yet.")
+                with __recording__(self.metrics), __span__("agetTickers", market=market, scrape=not fresh):
+                    if extractor is not None:
+                        ticker_database = await extractor(market_shortname=market,use_web=not fresh)
+                    else:
+                        ticker_database = await asyncio.to_thread(__get_extractor__(market, "tickers"), market_shortname=market, use_web=not fresh)
+                    output = MarketTickersOutput(
+                        ticker_database= ticker_database,
+                        index_ticker_list = await asyncio.to_thread(self.db_manager.__ticker_list__, market_shortname=market, type="INDEX"),
+                        share_ticker_list = await asyncio.to_thread(self.db_manager.__ticker_list__, market_shortname=market, type="SHARE")
+                    )
+                
+                # memoize only a list that is known to be fresh
+                if await asyncio.to_thread(self.__is_fresh__, market):
+                    with _tickers_memo_lock:
+                        _tickers_memo[memo_key] = output
+    
+            else:
+                raise ValueError(f"[Error] the defined market '{market}' is not part of those configured")
+            
+            
+            return __tickers_as__(output, output_format)
+        except ImportError as e:
+            print(e)
+        except Exception as e:
+            print("Check if you have an active internet connection.")
+        
+        
     def __full_ticker_list__(self,market):
         """
         Retrieve ticker list for a given market.
@@ -130,11 +249,26 @@ class MarketTickers:
         """
         try:
             output = []
-            if self.db_manager.__full_version_ticker_list__(market_shortname=market) == None:
+            if not self.db_manager.__full_version_ticker_list__(market_shortname=market) or not self.__is_fresh__(market):
                 self.getTickers(market=market)
                 
             output = self.db_manager.__full_version_ticker_list__(market_shortname=market)
         except Exception as e:
             print("Check if you have an active internet connection.")
         finally:
-            return(output)
\ No newline at end of file
+            return(output)
+        
+        
+    def __is_fresh__(self, market):
+        """
+        Tell whether the stored ticker list of a market was refreshed less than `ttl` ago.
+        
+        An empty stored list is never fresh, whatever its refresh time.
+        
+        Args:
+            market (str): The shortname of the market.
+        """
+        refreshed_at = self.db_manager.__tickers_refreshed_at__(market_shortname=market)
+        if refreshed_at is None or datetime.now() - refreshed_at >= self.ttl:
+            return False
+        return bool(self.db_manager.__ticker_list__(market_shortname=market))
@@ -0,0 +1,64 @@
+"""
+Shared fixtures: every test runs against the offline SikaFinance stand-in
+(`benchmarks/sika_server.py`) and a throwaway local database, so the suite needs
+no network access.
+
+    python -m pytest -q
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import pytest
+import sika_server
+
+# the endpoints and the database are read when marketflow is imported: set them first
+SOURCE = sika_server.SikaStandIn(sika_server.make_symbols(6))
+SERVER, URL = sika_server.serve(SOURCE)
+os.environ["MARKETFLOW_SIKAFINANCE_URL"] = URL
+os.environ["MARKETFLOW_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="marketflow-tests-"), "database.db")
+os.environ.pop("MARKETFLOW_RESPONSE_CACHE", None)
+
+from marketflow import MarketRegistry
+from marketflow.__marketconfig__ import __http_client__
+
+
+@pytest.fixture
+def sika():
+    """
+    The stand-in server's data source, reset to a reliable state with fresh counters.
+    """
+    SOURCE.error_rate = 0.0
+    SOURCE.latency = 0.0
+    SOURCE.symbols = sika_server.make_symbols(6)
+    SOURCE.stats.update({key: 0 for key in SOURCE.stats})
+    return SOURCE
+
+
+@pytest.fixture(autouse=True)
+def store(sika):
+    """
+    An empty local store with the markets configured, and the default HTTP settings restored afterwards.
+    """
+    MarketRegistry().purge()
+    MarketRegistry()
+    settings = dict(__http_client__.HTTP_CONFIG)
+    yield
+    __http_client__.HTTP_CONFIG.update(settings)
+    __http_client__.configure_http()
+
+
+@pytest.fixture
+def quiet():
+    """
+    Silence the progress messages printed by the extractors.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
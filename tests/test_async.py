@@ -0,0 +1,72 @@
+"""
+The awaitable API returns what the blocking one does, and leaves the event loop free
+while the local database is busy.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from marketflow import MarketData, MarketRegistry, MarketTickers
+
+pytest.importorskip("httpx")
+
+REQUEST = dict(start_date="2024-01-01", end_date="2024-06-30")
+
+
+def test_agetdata_matches_getdata(sika, quiet):
+    awaited = asyncio.run(MarketData().agetData("BRVM", ["S000X", "S001X"], **REQUEST))
+    assert sika.stats["histos"] > 0
+
+    MarketRegistry().purge()
+    MarketRegistry()
+    expected = MarketData().getData("BRVM", ["S000X", "S001X"], **REQUEST)
+    assert_frame_equal(awaited.by_row, expected.by_row)
+    assert_frame_equal(awaited.by_col, expected.by_col)
+
+
+def test_agetdata_reads_the_stored_history(sika, quiet):
+    expected = MarketData().getData("BRVM", ["S000X"], **REQUEST)
+    sent = sika.stats["histos"]
+    awaited = asyncio.run(MarketData().agetData("BRVM", ["S000X"], **REQUEST))
+    assert sika.stats["histos"] == sent
+    assert_frame_equal(awaited.by_col, expected.by_col)
+
+
+def test_agettickers_matches_gettickers(sika, quiet):
+    awaited = asyncio.run(MarketTickers().agetTickers("BRVM", force_refresh=True))
+    expected = MarketTickers().getTickers("BRVM")
+    assert awaited.ticker_list == expected.ticker_list
+    assert len(awaited.ticker_list) == len(sika.symbols)
+
+
+def test_locked_database_does_not_block_the_event_loop(sika, quiet):
+    # a first call does the imports; the second one stores a new symbol while a writer holds the database
+    asyncio.run(MarketData().agetData("BRVM", ["S000X"], **REQUEST))
+
+    lock = sqlite3.connect(MarketData().db_manager.db_path, check_same_thread=False)
+    lock.execute("BEGIN EXCLUSIVE")
+    threading.Timer(0.5, lock.rollback).start()
+
+    async def main():
+        ticks, stalls = [time.monotonic()], []
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(0.01)
+                stalls.append(time.monotonic() - ticks[-1])
+                ticks.append(time.monotonic())
+
+        beating = asyncio.create_task(heartbeat())
+        output = await MarketData().agetData("BRVM", ["S001X"], **REQUEST)
+        beating.cancel()
+        return output, max(stalls)
+
+    output, stall = asyncio.run(main())
+    lock.close()
+    assert output is not None and not output.by_row.empty
+    assert stall < 0.25
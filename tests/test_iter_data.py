@@ -0,0 +1,74 @@
+"""
+Streaming with `iter_data`: one frame per symbol, and the `failed` set naming the
+symbols whose windows could not all be downloaded.
+"""
+
+from marketflow import MarketData, configure_http
+from marketflow.__marketconfig__.dataextraction import brvm_data
+from marketflow.market_cli import main
+
+REQUEST = dict(start_date="2024-01-01", end_date="2024-06-30")
+
+
+def __failing_for__(monkeypatch, symbol):
+    """Make every GetHistos call of one native ticker fail; return the calls made for it."""
+    calls = []
+    fetch = brvm_data.__fetch_window__
+
+    def flaky(url, full_symbol, row_period, frequency, refresh=False):
+        if full_symbol.split(".")[0] == symbol:
+            calls.append(row_period)
+            return None
+        return fetch(url, full_symbol, row_period, frequency, refresh)
+
+    monkeypatch.setattr(brvm_data, "__fetch_window__", flaky)
+    configure_http(max_attempts=2, requeue_backoff=0)
+    return calls
+
+
+def test_each_symbol_is_streamed_complete(sika, quiet):
+    failed = set()
+    streamed = dict(MarketData().iter_data("BRVM", ["S000X", "S001X"], failed=failed, **REQUEST))
+
+    assert [symbol.split(".")[0] for symbol in streamed] == ["S000X", "S001X"]
+    assert all(frame.index.min().strftime("%Y-%m-%d") >= "2024-01-01" for frame in streamed.values())
+    assert all(frame.index.max().strftime("%Y-%m-%d") <= "2024-06-30" for frame in streamed.values())
+    assert failed == set()
+
+
+def test_symbols_with_failed_windows_are_reported(sika, quiet, monkeypatch):
+    calls = __failing_for__(monkeypatch, "S001X")
+    failed = set()
+    streamed = dict(MarketData().iter_data("BRVM", ["S000X", "S001X", "S002X"], max_workers=2, failed=failed, **REQUEST))
+
+    assert {symbol.split(".")[0] for symbol in failed} == {"S001X"}
+    # a symbol without any downloaded row is not streamed, the others are
+    assert {symbol.split(".")[0] for symbol in streamed} == {"S000X", "S002X"}
+    # every window was tried `max_attempts` times
+    assert len(calls) == 2 * len(set(calls))
+
+
+def test_failed_windows_are_requested_again(sika, quiet, monkeypatch):
+    calls = __failing_for__(monkeypatch, "S001X")
+    list(MarketData().iter_data("BRVM", ["S000X", "S001X"], failed=set(), **REQUEST))
+    missed = set(calls)
+
+    monkeypatch.undo()
+    sent = sika.stats["histos"]
+    failed = set()
+    list(MarketData().iter_data("BRVM", ["S000X", "S001X"], failed=failed, **REQUEST))
+    # only the windows that failed are downloaded, and the symbol is now complete
+    assert sika.stats["histos"] - sent == len(missed)
+    assert failed == set()
+
+
+def test_fetch_exits_with_1_on_an_incomplete_symbol(sika, quiet, monkeypatch, tmp_path):
+    argv = ["fetch", "BRVM", "--symbols", "S000X", "S001X", "--start", "2024-01-01", "--end", "2024-06-30",
+            "--output-dir", str(tmp_path)]
+    __failing_for__(monkeypatch, "S001X")
+    assert main(argv) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["S000X.csv"]
+
+    monkeypatch.undo()
+    assert main(argv) == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["S000X.csv", "S001X.csv"]
@@ -0,0 +1,57 @@
+"""
+Coverage of the local store: only final bars are recorded as downloaded, and the
+end-of-day refresher leaves nothing for the day's `getData` calls to download.
+"""
+
+from datetime import datetime, timedelta
+
+from marketflow import MarketData, MarketRefresher
+from marketflow.__marketconfig__.dataextraction import brvm_data
+
+
+def __settle__(monkeypatch, day):
+    """Pretend that `day` is the last settled session."""
+    monkeypatch.setattr(brvm_data, "__settled_until__", lambda now=None: day)
+
+
+def __covered__(period, start_date, end_date):
+    return brvm_data.db_manager.__covered_ranges__("BRVM", "S000X.ci", period, start_date, end_date)
+
+
+def __requests__(sika, period, start_date, end_date):
+    """Run one getData for S000X; return the GetHistos requests sent."""
+    sent = sika.stats["histos"]
+    MarketData().getData("BRVM", ["S000X"], period=period, start_date=start_date, end_date=end_date)
+    return sika.stats["histos"] - sent
+
+
+def test_open_week_is_not_covered_until_it_closes(sika, quiet, monkeypatch):
+    __settle__(monkeypatch, "2024-01-17")
+    assert __requests__(sika, "weekly", "2024-01-01", "2024-01-19") > 0
+    # the week of 2024-01-15 is still open: its bar is requested again
+    assert __covered__("weekly", "2024-01-01", "2024-01-19") == [("2024-01-01", "2024-01-12")]
+    assert __requests__(sika, "weekly", "2024-01-01", "2024-01-19") > 0
+
+    __settle__(monkeypatch, "2024-01-19")
+    __requests__(sika, "weekly", "2024-01-01", "2024-01-19")
+    assert __covered__("weekly", "2024-01-01", "2024-01-19") == [("2024-01-01", "2024-01-19")]
+    assert __requests__(sika, "weekly", "2024-01-01", "2024-01-19") == 0
+
+
+def test_open_month_is_not_covered_but_settled_days_are(sika, quiet, monkeypatch):
+    __settle__(monkeypatch, "2024-01-17")
+    __requests__(sika, "monthly", "2023-11-01", "2024-01-17")
+    __requests__(sika, "daily", "2023-11-01", "2024-01-17")
+
+    assert __covered__("monthly", "2023-11-01", "2024-01-17") == [("2023-11-01", "2023-12-31")]
+    assert __covered__("daily", "2023-11-01", "2024-01-17") == [("2023-11-01", "2024-01-17")]
+    assert __requests__(sika, "daily", "2023-11-01", "2024-01-17") == 0
+
+
+def test_refresh_warms_the_store(sika, quiet):
+    summary = MarketRefresher(markets=["BRVM"], lookback_days=10, max_workers=2).refresh()
+    assert summary == {"BRVM": {"daily": len(sika.symbols)}}
+    assert sika.stats["histos"] > 0
+
+    start_date = (datetime.today() - timedelta(10)).strftime("%Y-%m-%d")
+    assert __requests__(sika, "daily", start_date, datetime.today().strftime("%Y-%m-%d")) == 0
@@ -0,0 +1,61 @@
+"""
+Weekly, monthly and yearly bars built locally from the daily history.
+"""
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from marketflow import MarketData
+from marketflow.__marketconfig__.dataextraction import brvm_data
+
+REQUEST = dict(start_date="2024-01-01", end_date="2024-03-29")
+
+
+def __daily__(ticker, dates):
+    """Daily rows of one ticker: the n-th day opens at n, closes at n + 0.5 and trades 10 * n."""
+    n = range(1, len(dates) + 1)
+    return pd.DataFrame({"Date": dates, "Open": list(n), "High": [i + 1 for i in n], "Low": [i - 1 for i in n],
+                         "Close": [i + 0.5 for i in n], "Volume": [10 * i for i in n], "Ticker": ticker})
+
+
+def test_bars_aggregate_their_days():
+    days = ["2024-01-08", "2024-01-09", "2024-01-10", "2024-01-11", "2024-01-12", "2024-01-15", "2024-01-16"]
+    bars = brvm_data.__resample_frame__(__daily__("S000X", days), "weekly")
+
+    assert bars["Date"].tolist() == ["2024-01-12", "2024-01-19"]
+    assert bars[["Open", "High", "Low", "Close", "Volume"]].values.tolist() == [[1, 6, 0, 5.5, 150], [6, 8, 5, 7.5, 130]]
+    assert (bars["Ticker"] == "S000X").all()
+
+
+def test_bars_are_dated_by_period_end_whatever_the_last_trade():
+    # S001X does not trade on Friday 2024-01-12 nor after 2024-01-29
+    full = brvm_data.__resample_frame__(__daily__("S000X", ["2024-01-11", "2024-01-12", "2024-01-30", "2024-01-31"]), "weekly")
+    gaps = brvm_data.__resample_frame__(__daily__("S001X", ["2024-01-10", "2024-01-11", "2024-01-29"]), "weekly")
+    assert full["Date"].tolist() == gaps["Date"].tolist() == ["2024-01-12", "2024-02-02"]
+
+    monthly = brvm_data.__resample_frame__(__daily__("S001X", ["2024-01-10", "2024-02-27"]), "monthly")
+    yearly = brvm_data.__resample_frame__(__daily__("S001X", ["2023-05-10", "2024-02-27"]), "yearly")
+    assert monthly["Date"].tolist() == ["2024-01-31", "2024-02-29"]
+    assert yearly["Date"].tolist() == ["2023-12-31", "2024-12-31"]
+
+
+def test_resampled_data_match_the_stored_daily_history(sika, quiet):
+    daily = MarketData().getData("BRVM", ["S000X", "S001X"], **REQUEST)
+    sent = sika.stats["histos"]
+    weekly = MarketData().getData("BRVM", ["S000X", "S001X"], period="weekly", resample=True, **REQUEST)
+    # the daily bars are already stored: nothing is downloaded
+    assert sika.stats["histos"] == sent
+
+    rows = daily.by_row.reset_index()
+    rows["Date"] = rows["Date"].dt.strftime("%Y-%m-%d")
+    rows["Ticker"] = rows["Ticker"].astype(str)
+    expected = pd.concat([brvm_data.__resample_frame__(frame, "weekly") for _, frame in rows.groupby("Ticker")])
+    got = weekly.by_row.reset_index()
+    got["Date"] = got["Date"].dt.strftime("%Y-%m-%d")
+    got["Ticker"] = got["Ticker"].astype(str)
+    assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+    # one row per week, both tickers side by side
+    assert weekly.by_col.shape[0] == 13
+    assert weekly.by_col.index[-1].strftime("%Y-%m-%d") == "2024-03-29"
+    assert not weekly.by_col.isna().any().any()
@@ -0,0 +1,59 @@
+"""
+Disk cache of the GetHistos responses: closed windows are kept for good, a window
+reaching today expires after the TTL.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from marketflow import MarketData, MarketRegistry, configure_http
+from marketflow.__marketconfig__.dataextraction import brvm_data
+from marketflow.__response_cache__ import ResponseCache
+
+
+def test_entry_that_may_change_expires_after_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.__write__("url", {"window": 1}, b"closed", permanent=True)
+    cache.__write__("url", {"window": 2}, b"open", permanent=False)
+    assert cache.__read__("url", {"window": 2}) == b"open"
+
+    later = datetime.now().timestamp() + 61
+    monkeypatch.setattr("marketflow.__response_cache__.time", SimpleNamespace(time=lambda: later))
+    assert cache.__read__("url", {"window": 1}) == b"closed"
+    assert cache.__read__("url", {"window": 2}) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=3000)
+    for i in range(10):
+        cache.__write__("url", {"window": i}, bytes(range(256)) * 4)
+    assert cache.__read__("url", {"window": 9}) is not None
+    assert cache.__read__("url", {"window": 0}) is None
+
+
+def __fetch_from_empty_store__(sika):
+    """Run the same request on an emptied local store; return the GetHistos requests sent."""
+    MarketRegistry().purge()
+    MarketRegistry()
+    sent = sika.stats["histos"]
+    MarketData().getData("BRVM", ["S001X"], start_date=(datetime.today() - timedelta(120)).strftime("%Y-%m-%d"))
+    return sika.stats["histos"] - sent
+
+
+def test_closed_windows_are_served_from_the_cache(sika, quiet, tmp_path, monkeypatch):
+    # the last window ends today: its response may still change
+    monkeypatch.setattr(brvm_data, "__settled_until__", lambda now=None: datetime.today().strftime("%Y-%m-%d"))
+    configure_http(response_cache_dir=str(tmp_path), response_cache_ttl=0)
+
+    assert __fetch_from_empty_store__(sika) >= 2
+    # the TTL is over: only the window reaching today is requested again
+    assert __fetch_from_empty_store__(sika) == 1
+
+
+def test_refresh_bypasses_and_replaces_the_cache(sika, quiet, tmp_path):
+    configure_http(response_cache_dir=str(tmp_path))
+    query = lambda **options: MarketData().getData("BRVM", ["S001X"], start_date="2024-01-01", end_date="2024-06-30", **options)
+    query()
+    sent = sika.stats["histos"]
+    query(refresh=True)
+    assert sika.stats["histos"] - sent == 3
@@ -0,0 +1,69 @@
+"""
+Request scheduling: the token bucket's rate, and the requeue of failed jobs by priority.
+"""
+
+import time
+
+from marketflow.__marketconfig__.__scheduler__ import JobScheduler, TokenBucket
+
+
+def test_token_bucket_caps_the_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # the first token is in reserve, the next ten come at 50 per second
+    assert time.monotonic() - start >= 10 / 50 * 0.95
+
+
+def test_token_bucket_serves_its_burst_at_once():
+    bucket = TokenBucket(rate=1, burst=5)
+    assert [bucket.__reserve__() for _ in range(5)] == [0.0] * 5
+    assert bucket.__reserve__() > 0.9
+
+
+def test_failed_jobs_are_requeued_after_a_backoff():
+    tries = {}
+
+    def flaky(job):
+        tries.setdefault(job, []).append(time.monotonic())
+        # job "b" succeeds on its third try, job "c" never does
+        if job == "a" or (job == "b" and len(tries[job]) == 3):
+            return job.upper()
+        if job == "c":
+            raise RuntimeError("503")
+        return None
+
+    reports = []
+    scheduler = JobScheduler(flaky, max_attempts=3, backoff=0.05, progress=reports.append)
+    results = dict(scheduler.run(["a", "b", "c"]))
+
+    assert results == {"a": "A", "b": "B", "c": None}
+    assert len(tries["a"]) == 1 and len(tries["b"]) == 3 and len(tries["c"]) == 3
+    # exponential backoff, with at most 25% of jitter
+    waits = [later - earlier for earlier, later in zip(tries["b"], tries["b"][1:])]
+    assert waits[0] >= 0.05 * 0.75 and waits[1] >= 0.1 * 0.75
+    assert reports[-1] == {"done": 3, "failed": 1, "retried": 4, "total": 3}
+    assert [report["done"] for report in reports] == [1, 2, 3]
+
+
+def test_jobs_run_by_priority_while_others_wait_for_their_retry():
+    order = []
+
+    def run(job):
+        order.append(job)
+        return None if job == "first" and order.count(job) == 1 else job
+
+    scheduler = JobScheduler(run, max_attempts=2, backoff=0.05)
+    results = list(scheduler.run(["late", "first", "second"], priorities=[(1, 0), (0, 0), (0, 5)]))
+
+    # the failed job waits for its backoff while the next ones run
+    assert order == ["first", "second", "late", "first"]
+    assert [job for job, _ in results] == ["second", "late", "first"]
+
+
+def test_threaded_run_yields_every_job_once():
+    scheduler = JobScheduler(lambda job: None if job % 7 == 0 else job, max_workers=4, max_attempts=2, backoff=0.01)
+    results = dict(scheduler.run(list(range(30))))
+    assert sorted(results) == list(range(30))
+    assert sorted(job for job, result in results.items() if result is None) == [0, 7, 14, 21, 28]